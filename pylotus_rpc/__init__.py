@@ -1,4 +1,6 @@
 # include imports
 from .lotus_client import LotusClient
 from .http_json_rpc_connector import HttpJsonRpcConnector
+from .async_http_json_rpc_connector import AsyncHttpJsonRpcConnector
 
+from .async_lotus_client import AsyncLotusClient
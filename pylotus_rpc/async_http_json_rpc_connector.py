@@ -0,0 +1,162 @@
+import asyncio
+import itertools
+from typing import List, Optional
+from .http_json_rpc_connector import HttpJsonRpcConnector, _RpcEndpoint, _dumps, _import_httpx, _loads, _log_debug
+
+# aiohttp is an optional dependency, only required by the async connector.  Importing it takes
+# longer than the rest of the package together, so it is loaded when the first connector is created.
+aiohttp = None
+
+
+def _import_aiohttp() -> None:
+    global aiohttp
+    if aiohttp is None:
+        try:
+            import aiohttp as module
+        except ImportError:
+            raise ImportError("AsyncHttpJsonRpcConnector requires aiohttp, install it with 'pip install pylotus-rpc[async]'") from None
+        aiohttp = module
+
+
+# httpx is only required when the connector is created with http2=True
+httpx = None
+
+
+def _load_httpx() -> None:
+    global httpx
+    httpx = _import_httpx()
+
+
+class AsyncHttpJsonRpcConnector(_RpcEndpoint):
+    def __init__(self, host='http://localhost/rpc/v0', port=None, api_token=None, limit=32, limit_per_host=16, http2=False):
+        """
+        Initializes an instance of the AsyncHttpJsonRpcConnector class.
+
+        The asynchronous counterpart of `HttpJsonRpcConnector`.  Requests are sent through a
+        single `aiohttp.ClientSession`, so independent calls can be awaited concurrently with
+        `asyncio.gather` while sharing a pool of keep-alive connections.
+
+        :param host: The server's hostname or IP address (default is 'localhost').
+        :param port: The server's port (default is None).
+        :param api_token: The API token for authentication (default is None).
+        :param limit: The maximum number of simultaneous connections (default is 32).
+        :param limit_per_host: The maximum number of simultaneous connections to the node (default is 16).
+        :param http2: Use an HTTP/2 capable `httpx.AsyncClient` instead of `aiohttp`, so concurrent
+                      requests are multiplexed over a single connection (requires httpx[http2]).
+        """
+        self.http2 = http2
+        if http2:
+            _load_httpx()
+            self._network_errors = (httpx.HTTPError,)
+        else:
+            _import_aiohttp()
+            self._network_errors = (aiohttp.ClientError, asyncio.TimeoutError)
+
+        self._init_endpoint(host, port, api_token)
+
+        self._id_counter = itertools.count(1)
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+
+        # the session has to be created from within a running event loop, so it
+        # is created on first use
+        self._session = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+
+    def _get_session(self):
+        """
+        Returns the shared client session (an `aiohttp.ClientSession`, or an `httpx.AsyncClient`
+        for HTTP/2), creating it on first use.
+        """
+        if self.http2:
+            if self._session is None or self._session.is_closed:
+                self._session = httpx.AsyncClient(
+                    http2=True,
+                    headers=self._headers,
+                    timeout=300,
+                    limits=httpx.Limits(max_connections=self._limit, max_keepalive_connections=self._limit_per_host)
+                )
+                self._semaphore = asyncio.Semaphore(self._limit)
+        elif self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self._limit, limit_per_host=self._limit_per_host)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self._headers,
+                timeout=aiohttp.ClientTimeout(total=300)
+            )
+            self._semaphore = asyncio.Semaphore(self._limit)
+        return self._session
+
+
+    async def close(self) -> None:
+        """
+        Closes the underlying client session and releases any pooled connections.
+        """
+        if self._session is not None:
+            if self.http2:
+                await self._session.aclose()
+            else:
+                await self._session.close()
+            self._session = None
+
+
+    async def __aenter__(self) -> 'AsyncHttpJsonRpcConnector':
+        return self
+
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+
+    async def execute(self, payload: dict, debug=False) -> dict:
+        """
+        Executes a JSON RPC request using the specified payload and returns the response.
+
+        :param payload: A dictionary containing the JSON RPC request payload.
+        :param debug: A boolean flag that, when set to True, enables the printing of debug
+                      information like the request payload and response.
+        :return: A dictionary containing the parsed JSON response from the server.
+        :raises: HttpJsonRpcConnector.ApiCallError if there's an error in making the API call
+                 or if the response status code is not 200.
+        """
+        payload["id"] = next(self._id_counter)
+
+        _log_debug(debug, f"using endpoint {self._endpoint}")
+        _log_debug(debug, "request:", payload)
+
+        session = self._get_session()
+        try:
+            async with self._semaphore:
+                if self.http2:
+                    response = await session.post(self._endpoint, content=_dumps(payload))
+                    status = response.status_code
+                    body = response.content
+                else:
+                    async with session.post(self._endpoint, data=_dumps(payload)) as response:
+                        status = response.status
+                        body = await response.read()
+        except self._network_errors as e:
+            raise HttpJsonRpcConnector.ApiCallError(payload["method"], 0, str(e)) from e
+
+        if status != 200:
+            raise HttpJsonRpcConnector.ApiCallError(payload["method"], status, body.decode(errors="replace"))
+
+        data = _loads(body)
+        _log_debug(debug, "response:", data)
+
+        return data
+
+
+    async def execute_many(self, payloads: List[dict], debug=False) -> List[dict]:
+        """
+        Executes several independent JSON RPC requests concurrently.
+
+        The requests are sent in parallel over the shared session, bounded by the connector's
+        connection limit, and the parsed responses are returned in the same order as `payloads`.
+
+        :param payloads: A list of JSON RPC request payloads.
+        :param debug: Enables the printing of debug information for every request.
+        :return: A list of dictionaries containing the parsed JSON responses.
+        """
+        return await asyncio.gather(*(self.execute(payload, debug=debug) for payload in payloads))
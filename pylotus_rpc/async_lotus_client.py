@@ -0,0 +1,61 @@
+from functools import partial
+from .async_http_json_rpc_connector import AsyncHttpJsonRpcConnector
+from .lotus_client import LotusClient, _PayloadRecorded, _PayloadRecorder
+
+
+class AsyncLotusClient:
+    """
+    The asynchronous counterpart of `LotusClient`.
+
+    `State`, `Chain` and `Net` expose the same methods as on `LotusClient`, but every call
+    returns a coroutine, so independent calls can be awaited concurrently:
+
+        >>> info, power = await asyncio.gather(client.State.miner_info(address),
+        ...                                    client.State.miner_power(address))
+
+    The streaming `iter_*` methods are not available, and the `max_age` of `Chain.head` and
+    `Net.addrs_listen` has no effect: every call asks the node.
+    """
+
+    def __init__(self, connector: AsyncHttpJsonRpcConnector):
+        self.connector = connector
+        self.State = AsyncLotusClient._Namespace(self, "State")
+        self.Chain = AsyncLotusClient._Namespace(self, "Chain")
+        self.Net = AsyncLotusClient._Namespace(self, "Net")
+
+    async def close(self) -> None:
+        await self.connector.close()
+
+    async def __aenter__(self) -> 'AsyncLotusClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def _call(self, namespace: str, method_name: str, *args, **kwargs):
+        # The method of the synchronous client is run against a recorder to find out
+        # which request it sends.  That request is awaited on the async connector and the
+        # method is run again with the response, until it completes without a new request.
+        responses = []
+        while True:
+            recorder = _PayloadRecorder(tuple(responses))
+            method = getattr(getattr(LotusClient, namespace)(recorder), method_name)
+            try:
+                return method(*args, **kwargs)
+            except _PayloadRecorded:
+                responses.append(await self.connector.execute(recorder.payload))
+
+    class _Namespace:
+
+        def __init__(self, client: 'AsyncLotusClient', namespace: str):
+            self._client = client
+            self._namespace = namespace
+
+        def __getattr__(self, method_name: str):
+            # fail early for methods that don't exist on the namespace
+            getattr(getattr(LotusClient, self._namespace), method_name)
+            # streaming methods read their response incrementally, or send their requests
+            # lazily while being iterated, so they can't be recorded and replayed
+            if method_name.startswith("iter_"):
+                raise TypeError(f"{self._namespace}.{method_name} streams its results and is not available on AsyncLotusClient")
+            return partial(self._client._call, self._namespace, method_name)
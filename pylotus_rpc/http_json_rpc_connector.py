@@ -1,53 +1,197 @@
 import requests
-import time
+from requests.adapters import HTTPAdapter
+import contextlib
+import itertools
 import json
-from typing import List, Optional
+import logging
+from typing import Iterator, List, Optional
 from .types.tip_set import Tipset
 from urllib.parse import urlparse
 
+# ijson is an optional dependency, only required to stream large responses
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
-class HttpJsonRpcConnector:
-    def __init__(self, host='http://localhost/rpc/v0', port=None, api_token=None):
-        """
-        Initializes an instance of the HttpJsonRpcConnector class.
+# orjson and ujson are optional dependencies; the fastest one installed is used
+# to encode request bodies and decode responses, otherwise we fall back to the
+# stdlib json module.
+try:
+    import orjson
 
-        :param host: The server's hostname or IP address (default is 'localhost').
-        :param port: The server's port (default is None).
-        :param api_token: The API token for authentication (default is None).
-        """
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+
+    def _pretty(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+except ImportError:
+    try:
+        import ujson
+
+        def _dumps(obj) -> bytes:
+            return ujson.dumps(obj, escape_forward_slashes=False).encode()
+
+        _loads = ujson.loads
+
+    except ImportError:
+        def _dumps(obj) -> bytes:
+            return json.dumps(obj, separators=(",", ":")).encode()
+
+        _loads = json.loads
+
+    def _pretty(obj) -> str:
+        return json.dumps(obj, indent=4)
+
+
+_log = logging.getLogger(__name__)
+
+# size of the chunks read from the socket when streaming a response
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# transport failures reported as an ApiCallError; anything else is a bug and is left to propagate
+_NETWORK_ERRORS = (requests.RequestException,)
+
+# httpx is an optional dependency, only required for HTTP/2 connections.  It is imported when the
+# first HTTP/2 connector is created, so HTTP/1.1 users don't pay for loading it.
+httpx = None
+
+
+def _import_httpx():
+    global httpx, _NETWORK_ERRORS
+    if httpx is None:
+        try:
+            import httpx as module
+        except ImportError:
+            raise ImportError("HTTP/2 support requires httpx, install it with 'pip install pylotus-rpc[http2]'") from None
+        httpx = module
+        _NETWORK_ERRORS = _NETWORK_ERRORS + (module.HTTPError,)
+    return httpx
+
+
+def _log_debug(debug: bool, message: str, obj=None) -> None:
+    """
+    Writes debug output to stdout when `debug` is set, otherwise to the module logger.
+
+    The JSON object is only pretty-printed when the output will actually be written, so
+    debugging costs nothing on the request path unless it is enabled.
+    """
+    if not debug and not _log.isEnabledFor(logging.DEBUG):
+        return
+
+    if obj is not None:
+        message = f"{message}\n{_pretty(obj)}"
+
+    if debug:
+        print(message)
+    else:
+        _log.debug(message)
+
+
+class _RpcEndpoint:
+    """
+    The endpoint URL and request headers shared by the synchronous and asynchronous connectors.
+
+    Both are built once rather than on every request.  The property setters rebuild them when
+    a part changes, and keep the headers of an already created session in sync.
+    """
+    _session = None
+
+    def _init_endpoint(self, host: str, port: Optional[int], api_token: Optional[str]) -> None:
         # Parse the host to get the scheme and path
         parsed_url = urlparse(host)
-        
-        self.scheme = parsed_url.scheme
-        self.path = parsed_url.path
+
+        self._scheme = parsed_url.scheme
+        self._path = parsed_url.path
 
         # If the port is not specified, we will try to use the one from the parsed URL.
         # If the parsed URL doesn't have one either, we will default to None.
-        self.port = port if port is not None else parsed_url.port
+        self._port = port if port is not None else parsed_url.port
 
         # If the host includes a netloc (network location part), use it.
         # Otherwise, fall back to the host parameter.
-        self.host = parsed_url.netloc.split(':')[0] if parsed_url.netloc else host
+        self._host = parsed_url.netloc.split(':')[0] if parsed_url.netloc else host
 
-        self.api_token = api_token
+        self._api_token = api_token
 
         # Ensure that the path starts with '/' if it's not empty.
-        if self.path and not self.path.startswith('/'):
-            self.path = '/' + self.path
+        if self._path and not self._path.startswith('/'):
+            self._path = '/' + self._path
 
+        self._endpoint = self._build_rpc_endpoint()
+        self._headers = self._build_request_headers()
 
-    class ApiCallError(Exception):
+
+    @property
+    def scheme(self) -> str:
+        return self._scheme
+
+    @scheme.setter
+    def scheme(self, value: str) -> None:
+        self._scheme = value
+        self._endpoint = self._build_rpc_endpoint()
+
+    @property
+    def host(self) -> str:
+        return self._host
+
+    @host.setter
+    def host(self, value: str) -> None:
+        self._host = value
+        self._endpoint = self._build_rpc_endpoint()
+
+    @property
+    def port(self) -> Optional[int]:
+        return self._port
+
+    @port.setter
+    def port(self, value: Optional[int]) -> None:
+        self._port = value
+        self._endpoint = self._build_rpc_endpoint()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @path.setter
+    def path(self, value: str) -> None:
+        self._path = value
+        self._endpoint = self._build_rpc_endpoint()
+
+    @property
+    def api_token(self) -> Optional[str]:
+        return self._api_token
+
+    @api_token.setter
+    def api_token(self, value: Optional[str]) -> None:
+        self._api_token = value
+        self._headers = self._build_request_headers()
+        # the session is created lazily by the async connector
+        if self._session is not None:
+            self._session.headers.pop("Authorization", None)
+            self._session.headers.update(self._headers)
+
+
+    def get_request_headers(self) -> dict:
         """
-        Exception raised when there's an error during an API call.
+        Returns the headers required for the JSON RPC request.
+
+        :return: Dictionary containing the request headers.
         """
-        def __init__(self, method_name: str, status_code: int, message: str):
-            super().__init__(f"Failed API call '{method_name}'. Status code: {status_code}. Message: {message}")
-            self.method_name = method_name
-            self.status_code = status_code
-            self.message = message
+        return self._headers
 
-    
-    def get_request_headers(self) -> dict:
+
+    def get_rpc_endpoint(self) -> str:
+        """
+        Returns the RPC endpoint URL.
+
+        :return: The full RPC endpoint URL.
+        """
+        return self._endpoint
+
+
+    def _build_request_headers(self) -> dict:
         """
         Constructs the headers required for the JSON RPC request.
 
@@ -59,7 +203,7 @@ class HttpJsonRpcConnector:
         return headers
 
 
-    def get_rpc_endpoint(self) -> str:
+    def _build_rpc_endpoint(self) -> str:
         """
         Constructs the RPC endpoint URL.
 
@@ -76,6 +220,84 @@ class HttpJsonRpcConnector:
         return endpoint
 
 
+class HttpJsonRpcConnector(_RpcEndpoint):
+    def __init__(self, host='http://localhost/rpc/v0', port=None, api_token=None, pool_connections=16, pool_maxsize=64, http2=False):
+        """
+        Initializes an instance of the HttpJsonRpcConnector class.
+
+        :param host: The server's hostname or IP address (default is 'localhost').
+        :param port: The server's port (default is None).
+        :param api_token: The API token for authentication (default is None).
+        :param pool_connections: The number of connection pools to cache (default is 16).
+        :param pool_maxsize: The maximum number of connections to keep alive per pool (default is 64).
+        :param http2: Use an HTTP/2 capable `httpx` client instead of `requests`, so concurrent
+                      calls are multiplexed over one connection (default is False).
+        """
+        self._init_endpoint(host, port, api_token)
+
+        # Request ids are drawn from a per-connector counter so they are unique
+        # even when several requests are sent within the same millisecond.
+        self._id_counter = itertools.count(1)
+
+        # A single session is shared by every call so that the underlying
+        # TCP/TLS connections are kept alive and reused between requests.
+        self.http2 = http2
+        if http2:
+            _import_httpx()
+            self._session = httpx.Client(
+                http2=True,
+                limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_connections)
+            )
+        else:
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+            self._session.mount('http://', adapter)
+            self._session.mount('https://', adapter)
+
+        # The headers never change between calls, so they are installed on the session
+        # once instead of being merged into every request.
+        self._session.headers.update(self._headers)
+
+
+    def close(self) -> None:
+        """
+        Closes the underlying HTTP session and releases any pooled connections.
+        """
+        self._session.close()
+
+
+    def __enter__(self) -> 'HttpJsonRpcConnector':
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+    class ApiCallError(Exception):
+        """
+        Exception raised when there's an error during an API call.
+        """
+        def __init__(self, method_name: str, status_code: int, message: str):
+            super().__init__(f"Failed API call '{method_name}'. Status code: {status_code}. Message: {message}")
+            self.method_name = method_name
+            self.status_code = status_code
+            self.message = message
+
+
+    def _post(self, body: bytes) -> requests.Response:
+        """
+        Posts an encoded request body to the RPC endpoint.
+
+        :param body: The JSON encoded request body.
+        :return: The server's response as a `requests.Response` (or `httpx.Response`) object.
+        """
+        if self.http2:
+            return self._session.post(self._endpoint, content=body, timeout=300)
+
+        return self._session.post(self._endpoint, data=body, timeout=300)
+
+
     def exec_method(self, payload: dict, debug=False) -> requests.Response:
         """
         Sends a JSON RPC request to the server with the provided payload.
@@ -85,24 +307,72 @@ class HttpJsonRpcConnector:
         """
         payload["id"] = self._generate_RPC_id()
 
-        if debug:
-            print(f"using endpoint {self.get_rpc_endpoint()}")
+        _log_debug(debug, f"using endpoint {self._endpoint}")
+
+        return self._post(_dumps(payload))
+
+    def execute_batch(self, payloads: List[dict], debug=False) -> List[dict]:
+        """
+        Executes several JSON RPC requests in a single HTTP round-trip.
+
+        The payloads are sent to the server as one JSON-RPC 2.0 batch (a JSON array of
+        requests).  Each payload is given a unique id, which is used to match the entries of
+        the response array back to their requests, since the server may answer them in any
+        order.  Errors for an individual request are returned in place as a response containing
+        an 'error' member, exactly as they would be for a single call.
+
+        :param payloads: A list of dictionaries containing the JSON RPC request payloads.
+        :param debug: A boolean flag that, when set to True, enables the printing of debug
+                      information like the request payloads and responses.
+        :return: A list of dictionaries containing the parsed JSON responses, in the same
+                 order as `payloads`.
+        :raises: ApiCallError if there's an error in making the API call or if the response
+                 status code is not 200.
+        """
+        if not payloads:
+            return []
+
+        for payload in payloads:
+            payload["id"] = self._generate_RPC_id()
+
+        method_names = ",".join(payload["method"] for payload in payloads)
+
+        _log_debug(debug, f"using endpoint {self._endpoint}")
+        _log_debug(debug, "request:", payloads)
+
+        try:
+            response = self._post(_dumps(payloads))
+        except _NETWORK_ERRORS as e:
+            raise HttpJsonRpcConnector.ApiCallError(method_names, 0, str(e)) from e
+
+        if response.status_code != 200:
+            raise HttpJsonRpcConnector.ApiCallError(method_names, response.status_code, response.text)
 
-        response = requests.post(
-            self.get_rpc_endpoint(), 
-            data=json.dumps(payload), 
-            headers=self.get_request_headers(),
-            timeout=300
-        )
-        return response
+        data = _loads(response.content)
+        _log_debug(debug, "response:", data)
 
-    def _generate_RPC_id(self) -> str:
+        # a single object instead of an array means the batch as a whole was rejected
+        if not isinstance(data, list):
+            raise HttpJsonRpcConnector.ApiCallError(method_names, response.status_code, response.text)
+
+        dct_responses = {dct_response.get("id"): dct_response for dct_response in data}
+        return [
+            dct_responses.get(payload["id"], {
+                "jsonrpc": "2.0",
+                "id": payload["id"],
+                "error": {"code": -32603, "message": "no response received for request"}
+            })
+            for payload in payloads
+        ]
+
+
+    def _generate_RPC_id(self) -> int:
         """
-        Generates a unique RPC ID based on the current timestamp.
+        Generates a unique RPC ID for this connector.
 
-        :return: A string representation of the current timestamp.
+        :return: The next value of a monotonically increasing counter.
         """
-        return int(time.time() * 1000)
+        return next(self._id_counter)
     
     def execute(self, payload: dict, debug=False) -> dict:
         """
@@ -115,30 +385,104 @@ class HttpJsonRpcConnector:
         :param payload: A dictionary containing the JSON RPC request payload. The payload
                         should include at least the 'method' name and the 'params' for the request.
         :param debug: A boolean flag that, when set to True, enables the printing of debug
-                      information like the request payload and response.
+                      information like the request payload and response.  The same output is
+                      sent to the 'pylotus_rpc.http_json_rpc_connector' logger when it is
+                      enabled for DEBUG.
         :return: A dictionary containing the parsed JSON response from the server.
         :raises: ApiCallError if there's an error in making the API call or if the response
                  status code is not 200.
         """
-        if debug:
-            print(json.dumps(payload, indent=4))
+        _log_debug(debug, "request:", payload)
 
         try:
             response = self.exec_method(payload, debug=debug)
-        except Exception as e:
-            raise HttpJsonRpcConnector.ApiCallError(payload["method"], 0, str(e))
+        except _NETWORK_ERRORS as e:
+            raise HttpJsonRpcConnector.ApiCallError(payload["method"], 0, str(e)) from e
 
         # Check if the request was successful
         if response.status_code == 200:
             # Parse the JSON response
-            if debug:
-                print(json.dumps(response.json(), indent=4))
+            data = _loads(response.content)
+            _log_debug(debug, "response:", data)
 
-            return response.json()
+            return data
         else:
             raise HttpJsonRpcConnector.ApiCallError(payload['method'], response.status_code, response.text)
 
 
+    def execute_stream(self, payload: dict, prefix: str = "result.item", debug=False) -> Iterator:
+        """
+        Executes a JSON RPC request and incrementally parses the response as it is received.
 
+        Rather than loading the whole response into memory, the body is fed to an `ijson`
+        parser chunk by chunk and every value found at `prefix` is yielded as soon as it has
+        been parsed.  This keeps memory usage flat for very large results such as the list of
+        every actor in the state tree.  The request is sent when iteration starts.
 
+        :param payload: A dictionary containing the JSON RPC request payload.
+        :param prefix: The ijson prefix of the values to yield, by default every item of the
+                       'result' array.
+        :param debug: A boolean flag that, when set to True, enables the printing of debug
+                      information like the request payload.
+        :return: An iterator over the parsed values found at `prefix`.
+        :raises: ApiCallError if there's an error in making the API call, if the response
+                 status code is not 200 or if the server returned a JSON-RPC error.
+        """
+        if ijson is None:
+            raise ImportError("Streaming responses requires ijson, install it with 'pip install pylotus-rpc[stream]'")
 
+        payload["id"] = self._generate_RPC_id()
+        _log_debug(debug, f"using endpoint {self._endpoint}")
+        _log_debug(debug, "request:", payload)
+        body = _dumps(payload)
+
+        with contextlib.ExitStack() as stack:
+            try:
+                if self.http2:
+                    response = stack.enter_context(self._session.stream(
+                        "POST", self._endpoint, content=body, timeout=300))
+                    chunks = response.iter_bytes(_STREAM_CHUNK_SIZE)
+                else:
+                    response = stack.enter_context(self._session.post(
+                        self._endpoint, data=body, timeout=300, stream=True))
+                    chunks = response.iter_content(_STREAM_CHUNK_SIZE)
+            except _NETWORK_ERRORS as e:
+                raise HttpJsonRpcConnector.ApiCallError(payload["method"], 0, str(e)) from e
+
+            if response.status_code != 200:
+                if self.http2:
+                    response.read()
+                raise HttpJsonRpcConnector.ApiCallError(payload["method"], response.status_code, response.text)
+
+            # the error member is parsed alongside the result, so a JSON-RPC error
+            # is reported instead of silently yielding nothing.  Numbers are parsed as
+            # floats rather than Decimals, the same as the execute() path.
+            items = ijson.sendable_list()
+            errors = ijson.sendable_list()
+            item_parser = ijson.items_coro(items, prefix, use_float=True)
+            error_parser = ijson.items_coro(errors, "error", use_float=True)
+
+            chunks = iter(chunks)
+            done = False
+            while not done:
+                # failures while reading or parsing the body are reported like the ones
+                # raised while sending the request, the items are yielded outside the try
+                try:
+                    chunk = next(chunks, None)
+                    done = chunk is None
+                    if done:
+                        item_parser.close()
+                        error_parser.close()
+                    else:
+                        item_parser.send(chunk)
+                        error_parser.send(chunk)
+                except _NETWORK_ERRORS as e:
+                    raise HttpJsonRpcConnector.ApiCallError(payload["method"], 0, str(e)) from e
+                except ijson.JSONError as e:
+                    raise HttpJsonRpcConnector.ApiCallError(payload["method"], response.status_code, f"invalid JSON response: {e}") from e
+
+                yield from items
+                del items[:]
+
+            if errors:
+                raise HttpJsonRpcConnector.ApiCallError(payload["method"], response.status_code, errors[0].get("message"))
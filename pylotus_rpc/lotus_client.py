@@ -1,7 +1,12 @@
 from pylotus_rpc.methods import state
 from pylotus_rpc.methods import chain
 from pylotus_rpc.methods import net
-from typing import Optional, List, Tuple, Dict
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import partial
+from threading import Lock
+from time import monotonic
+from typing import Optional, List, Tuple, Dict, Iterator
 from .types.tip_set import Tipset
 from .types.message import Message
 from .types.cid import Cid
@@ -15,7 +20,7 @@ from .types.deadline import Deadline
 from .types.miner_info import MinerInfo
 from .types.sector_pre_commit_info import SectorPreCommitInfo
 from .types.miner_partition import MinerPartition
-from .http_json_rpc_connector import HttpJsonRpcConnector
+from .http_json_rpc_connector import HttpJsonRpcConnector, _dumps, _loads
 from .types.miner_power import MinerPower
 from .types.deadline_info import DeadlineInfo
 from .types.message_lookup import MessageLookup
@@ -25,26 +30,352 @@ from .types.message_receipt import MessageReceipt
 from .types.head_change import HeadChange
 from .types.address_info import AddressInfo
 
-class LotusClient:
+class _PayloadRecorded(Exception):
+    """
+    Raised by `_PayloadRecorder` to stop an RPC helper once its payload has been captured.
+    """
+
+
+class _PayloadRecorder:
+    """
+    Stands in for a connector and captures the payload an RPC helper would send.
+
+    Responses already received for the helper's earlier requests are handed back in order,
+    so a helper that makes several requests can be stepped through one request at a time.
+    """
+    def __init__(self, responses: Tuple[dict, ...] = ()):
+        self.payload = None
+        self._responses = iter(responses)
+
+    def execute(self, payload: dict, debug=False) -> dict:
+        response = next(self._responses, None)
+        if response is not None:
+            return response
+        self.payload = payload
+        raise _PayloadRecorded()
+
+
+class _ResponseReplayer:
+    """
+    Stands in for a connector and hands an RPC helper the response received for it in a batch.
 
+    Any further request made by the helper is sent through the real connector.
+    """
+    def __init__(self, response: dict, connector: HttpJsonRpcConnector):
+        self.response = response
+        self.connector = connector
+
+    def execute(self, payload: dict, debug=False) -> dict:
+        if self.response is None:
+            return self.connector.execute(payload, debug=debug)
+        response, self.response = self.response, None
+        return response
+
+
+class _ResponseKeeper:
+    """
+    Wraps a connector and keeps the last response received, encoded, so that a fresh copy of
+    it can be parsed again later.
+    """
     def __init__(self, connector: HttpJsonRpcConnector):
         self.connector = connector
-        self.State = self.State(connector)
-        self.Chain = self.Chain(connector)
+        self.body = None
+
+    def execute(self, payload: dict, debug=False) -> dict:
+        response = self.connector.execute(payload, debug=debug)
+        self.body = _dumps(response)
+        return response
+
+
+# Chain methods addressing immutable objects: their result only depends on the cids or
+# tipset keys they are given, as long as none of them is left empty (which selects the head)
+_CONTENT_ADDRESSED_METHODS = frozenset((
+    "Filecoin.ChainGetBlock",
+    "Filecoin.ChainGetBlockMessages",
+    "Filecoin.ChainGetGenesis",
+    "Filecoin.ChainGetMessage",
+    "Filecoin.ChainGetMessagesInTipset",
+    "Filecoin.ChainGetParentMessages",
+    "Filecoin.ChainGetParentReceipts",
+    "Filecoin.ChainGetPath",
+    "Filecoin.ChainGetTipSet",
+    "Filecoin.ChainGetTipSetByHeight",
+    "Filecoin.ChainReadObj",
+    "Filecoin.ChainTipSetWeight",
+))
+
+
+def _is_cacheable(payload: dict) -> bool:
+    """
+    Tells whether the response to a payload can never change, and so may be cached.
+
+    Content addressed chain calls qualify unless a cid or tipset key is left empty or None,
+    which makes the node fall back to the chain head.  State calls qualify when they are pinned
+    to an explicit tipset, i.e. their last parameter is a tipset key rather than None (which
+    selects the chain head).
+    """
+    method = payload["method"]
+    params = payload.get("params")
+    if method in _CONTENT_ADDRESSED_METHODS:
+        return all(param is not None and param != [] for param in params)
+    if method.startswith("Filecoin.State") and params:
+        tipset_key = params[-1]
+        return (isinstance(tipset_key, list) and len(tipset_key) > 0
+                and all(isinstance(cid, dict) and "/" in cid for cid in tipset_key))
+    return False
+
+
+class _CachingConnector:
+    """
+    Wraps a connector and keeps the most recent successful responses of cacheable calls.
+
+    Filecoin tipsets are immutable, so a call pinned to a tipset (or addressing an object by
+    its cid) always returns the same result, and repeating it needs no round-trip to the node.
+    Threads making the same call while it is in flight wait for its response rather than
+    sending their own.  Responses are kept encoded and decoded again for every caller, so a
+    caller modifying its result can't change what the cache hands out next.
+    """
+    def __init__(self, connector: HttpJsonRpcConnector, maxsize: int):
+        self.connector = connector
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._responses = OrderedDict()
+        self._inflight = {}
+        self._lock = Lock()
+
+    def execute(self, payload: dict, debug=False) -> dict:
+        if not _is_cacheable(payload):
+            return self.connector.execute(payload, debug=debug)
+
+        key = _dumps((payload["method"], payload["params"]))
+        with self._lock:
+            body = self._responses.get(key)
+            if body is not None:
+                self._responses.move_to_end(key)
+                self.hits += 1
+                return _loads(body)
+
+            future = self._inflight.get(key)
+            sending = future is None
+            if sending:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not sending:
+            return _loads(future.result())
+
+        try:
+            response = self.connector.execute(payload, debug=debug)
+        except Exception as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        body = _dumps(response)
+        with self._lock:
+            del self._inflight[key]
+            if "error" not in response:
+                self._responses[key] = body
+                if len(self._responses) > self.maxsize:
+                    self._responses.popitem(last=False)
+        future.set_result(body)
+        return response
+
+    def clear(self) -> None:
+        with self._lock:
+            self._responses.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __getattr__(self, name: str):
+        # everything else (execute_stream, execute_batch, close, ...) goes straight to the
+        # wrapped connector; streamed and batched responses are never cached
+        return getattr(self.connector, name)
+
+
+class LotusClient:
+
+    def __init__(self, connector: HttpJsonRpcConnector, cache_size: int = 0):
+        """
+        :param connector: The connector used to send requests to the node.
+        :param cache_size: The number of responses to keep for calls whose result cannot change,
+                           i.e. state calls pinned to a tipset and content addressed chain calls.
+                           Caching is disabled when 0 (the default).
+        """
+        self.connector = connector
+        self._cache = _CachingConnector(connector, cache_size) if cache_size > 0 else None
+        self.State = self.State(self._cache or connector)
+        self.Chain = self.Chain(self._cache or connector)
         self.Net = self.Net(connector)
 
+    def close(self) -> None:
+        self.connector.close()
+
+    def __enter__(self) -> 'LotusClient':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def cache_info(self) -> Dict[str, int]:
+        """
+        Returns the hit and miss counts of the response cache, with its current and maximum size.
+        """
+        if self._cache is None:
+            return {"hits": 0, "misses": 0, "maxsize": 0, "currsize": 0}
+        return {"hits": self._cache.hits, "misses": self._cache.misses,
+                "maxsize": self._cache.maxsize, "currsize": len(self._cache._responses)}
+
+    def cache_clear(self) -> None:
+        """
+        Empties the response cache.
+        """
+        if self._cache is not None:
+            self._cache.clear()
+
+    def batch(self) -> 'LotusClient.Batch':
+        """
+        Returns a context manager that groups calls into a single JSON-RPC batch request.
+
+        Calls made through the batch's `State`, `Chain` and `Net` attributes are queued rather
+        than sent, and each returns a `concurrent.futures.Future`.  When the `with` block exits
+        the queued calls are sent to the node in one HTTP request and the futures are resolved.
+
+        If the `with` block raises, the queued calls are not sent and their futures are
+        cancelled.  The streaming `iter_*` methods can't be batched.  The `max_age` of `Chain.head` and
+        `Net.addrs_listen` has no effect in a batch, the node is always asked.
+
+        Example:
+            >>> with client.batch() as batch:
+            ...     futures = [batch.State.miner_power(address) for address in addresses]
+            >>> powers = [future.result() for future in futures]
+        """
+        return LotusClient.Batch(self)
+
+    class Batch:
+
+        def __init__(self, client: 'LotusClient'):
+            self.client = client
+            self._calls = []
+            self.State = LotusClient._BatchNamespace(self, "State")
+            self.Chain = LotusClient._BatchNamespace(self, "Chain")
+            self.Net = LotusClient._BatchNamespace(self, "Net")
+
+        def __enter__(self) -> 'LotusClient.Batch':
+            return self
+
+        def __exit__(self, exc_type, exc_value, traceback) -> None:
+            if exc_type is None:
+                self.execute()
+            else:
+                # the calls are never sent, don't leave anyone waiting on their futures
+                calls, self._calls = self._calls, []
+                for *_, future in calls:
+                    future.cancel()
+
+        def queue(self, namespace: str, method_name: str, *args, **kwargs) -> Future:
+            future = Future()
+            self._calls.append((namespace, method_name, args, kwargs, future))
+            return future
+
+        def execute(self) -> None:
+            """
+            Sends all queued calls in a single batch request and resolves their futures.
+            """
+            calls, self._calls = self._calls, []
+            connector = self.client.connector
+
+            # run each call against a recorder to find out which payload it sends
+            payloads = []
+            pending = []
+            for namespace, method_name, args, kwargs, future in calls:
+                recorder = _PayloadRecorder()
+                method = getattr(getattr(LotusClient, namespace)(recorder), method_name)
+                try:
+                    result = method(*args, **kwargs)
+                except _PayloadRecorded:
+                    payloads.append(recorder.payload)
+                    pending.append((namespace, method_name, args, kwargs, future))
+                except Exception as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+
+            try:
+                responses = connector.execute_batch(payloads)
+            except Exception as e:
+                for *_, future in pending:
+                    future.set_exception(e)
+                raise
+
+            # run each call again, this time handing it the response from the batch
+            for (namespace, method_name, args, kwargs, future), response in zip(pending, responses):
+                replayer = _ResponseReplayer(response, connector)
+                method = getattr(getattr(LotusClient, namespace)(replayer), method_name)
+                try:
+                    future.set_result(method(*args, **kwargs))
+                except Exception as e:
+                    future.set_exception(e)
+
+    class _BatchNamespace:
+
+        def __init__(self, batch: 'LotusClient.Batch', namespace: str):
+            self._batch = batch
+            self._namespace = namespace
+
+        def __getattr__(self, method_name: str):
+            # fail early for methods that don't exist on the namespace
+            getattr(getattr(LotusClient, self._namespace), method_name)
+            # streaming methods read their response incrementally, or send their requests
+            # lazily while being iterated, so they can't be recorded into the batch
+            if method_name.startswith("iter_"):
+                raise TypeError(f"{self._namespace}.{method_name} streams its results and can't be batched")
+            return partial(self._batch.queue, self._namespace, method_name)
+
     class Net:
+        __slots__ = ("connector", "_addrs_body", "_addrs_time", "_addrs_lock")
 
         def __init__(self, connector: HttpJsonRpcConnector):
             self.connector = connector
-
-        def addrs_listen(self) -> AddressInfo:
-            return net._addrs_listen(self.connector)
+            self._addrs_body = None
+            self._addrs_time = 0.0
+            self._addrs_lock = Lock()
+
+        def addrs_listen(self, max_age: float = 0) -> AddressInfo:
+            """
+            :param max_age: When set, the addresses fetched by an earlier call are returned if
+                            they are at most this many seconds old.  Each call still returns
+                            its own AddressInfo, parsed from the kept response.
+            """
+            if max_age <= 0:
+                return net._addrs_listen(self.connector)
+
+            with self._addrs_lock:
+                if self._addrs_body is None or monotonic() - self._addrs_time > max_age:
+                    keeper = _ResponseKeeper(self.connector)
+                    addrs = net._addrs_listen(keeper)
+                    self._addrs_body = keeper.body
+                    self._addrs_time = monotonic()
+                    return addrs
+                body = self._addrs_body
+
+            return net._addrs_listen(_ResponseReplayer(_loads(body), self.connector))
+
+        def agent_version(self, peer_id: str) -> str:
+            return net._agent_version(self.connector, peer_id)
 
     class Chain:
-        
+        __slots__ = ("connector", "_head_body", "_head_time", "_head_lock")
+
         def __init__(self, connector: HttpJsonRpcConnector):
             self.connector = connector
+            self._head_body = None
+            self._head_time = 0.0
+            self._head_lock = Lock()
 
         def tip_set_weight(self, tipset_key: List[dict]) -> int:
             return chain._tip_set_weight(self.connector, tipset_key)
@@ -56,7 +387,7 @@ class LotusClient:
             return chain._set_head(self.connector, head)
 
         def notify(self) -> Dict:
-            return chain._chain_notify(self.connector)
+            return chain._notify(self.connector)
 
         def has_obj(self, cid: str) -> bool:
             return chain._has_obj(self.connector, cid)
@@ -70,21 +401,33 @@ class LotusClient:
         def get_tipset_by_height(self, height: int, tipset_key: List[dict] = None) -> Tipset:
             return chain._get_tipset_by_height(self.connector, height, tipset_key)
 
+        def iter_tipsets(self, start_height: int, count: int, prefetch: int = 2) -> Iterator[Tuple[Tipset, List[BlockMessages]]]:
+            return chain._iter_tipsets(self.connector, start_height, count, prefetch)
+
         def get_path(self, start_tipset_key: List[dict], end_tipset_key: List[dict]) -> List[HeadChange]:
             return chain._get_path(self.connector, start_tipset_key, end_tipset_key)
 
         def get_parent_receipts(self, block_cid: str) -> List[MessageReceipt]:
             return chain._get_parent_receipts(self.connector, block_cid)
 
+        def iter_parent_receipts(self, block_cid: str) -> Iterator[MessageReceipt]:
+            return chain._iter_parent_receipts(self.connector, block_cid)
+
         def get_parent_messages(self, block_cid: str) -> List[WrappedMessage]:
             return chain._get_parent_messages(self.connector, block_cid)
 
+        def iter_parent_messages(self, block_cid: str) -> Iterator[WrappedMessage]:
+            return chain._iter_parent_messages(self.connector, block_cid)
+
         def get_node(self, node_path_selector: str) -> dict:
             return chain._get_node(self.connector, node_path_selector)
 
         def get_messages_in_tipset(self, tipset_key: List[dict]) -> List[Message]:
             return chain._get_messages_in_tipset(self.connector, tipset_key=tipset_key)
 
+        def iter_messages_in_tipset(self, tipset_key: List[dict]) -> Iterator[Message]:
+            return chain._iter_messages_in_tipset(self.connector, tipset_key)
+
         def get_message(self, cid: str) -> Message:
             return chain._get_message(self.connector, cid)
 
@@ -103,8 +446,28 @@ class LotusClient:
         def get_tip_set(self, tipset_key: List[dict]) -> Tipset:
             return chain._get_tip_set(self.connector, tipset_key)
 
-        def head(self) -> Tipset:
-            return chain._head(self.connector)
+        def head(self, max_age: float = 0) -> Tipset:
+            """
+            :param max_age: When set, the head fetched by an earlier call is returned if it is at
+                            most this many seconds old.  Concurrent callers wait for a single
+                            in-flight request instead of each fetching the head.  The encoded
+                            response is kept rather than the Tipset, and every caller gets a
+                            Tipset parsed from a fresh copy of it, so changes one caller makes
+                            can't leak into another's result.
+            """
+            if max_age <= 0:
+                return chain._head(self.connector)
+
+            with self._head_lock:
+                if self._head_body is None or monotonic() - self._head_time > max_age:
+                    keeper = _ResponseKeeper(self.connector)
+                    head = chain._head(keeper)
+                    self._head_body = keeper.body
+                    self._head_time = monotonic()
+                    return head
+                body = self._head_body
+
+            return chain._head(_ResponseReplayer(_loads(body), self.connector))
 
         def get_block(self, cid: str) -> BlockHeader:
             return chain._get_block(self.connector, cid)
@@ -114,6 +477,7 @@ class LotusClient:
                                    
 
     class State:
+        __slots__ = ("connector",)
 
         def __init__(self, connector: HttpJsonRpcConnector):
             self.connector = connector
@@ -234,6 +598,9 @@ class LotusClient:
                 
         def list_actors(self, tipset: Optional[Tipset] = None) -> List[str]:
             return state._list_actors(self.connector, tipset)
+
+        def iter_actors(self, tipset: Optional[Tipset] = None) -> Iterator[str]:
+            return state._iter_actors(self.connector, tipset)
         
         def get_actor(self, actor_id: str, tipset: Optional[Tipset] = None) -> Actor:
             return state._get_actor(self.connector, actor_id, tipset)
@@ -261,10 +628,7 @@ class LotusClient:
             return state._decode_params(self.connector, actor_id, method_num, params, tipset)
 
         def get_randomness_from_tickets(self, domain_tag: int, epoch: int, random_bytes: str, tipset: Optional[Tipset] = None) -> str:
-            # default to the chain head if not tipset was given
-           if not tipset:
-               tipset = chain._get_chain_head(self.connector)
-           return state._get_randomness_from_tickets(self.connector, domain_tag, epoch, random_bytes, tipset)
+            return state._get_randomness_from_tickets(self.connector, domain_tag, epoch, random_bytes, tipset)
 
         def get_randomness_from_beacon(self, domain_tag: int, epoch: int, random_bytes: str, tipset: Optional[Tipset] = None) -> str:
             return state._get_randomness_from_beacon(self.connector, domain_tag, epoch, random_bytes, tipset)
@@ -1,4 +1,6 @@
-from typing import List, Dict, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Iterator, Tuple
 from ..http_json_rpc_connector import HttpJsonRpcConnector
 from ..types.cid import Cid
 from ..types.tip_set import Tipset
@@ -12,20 +14,15 @@ from ..types.head_change import HeadChange
 def _make_payload(method: str, params: List):
     """
     Internal utility method to generate a JSON-RPC payload for a given method and parameters.
-    """
-    if params: 
-        payload = {
-            "jsonrpc": "2.0",
-            "method": method,
-            "params": params
-        }
-    else:
-        payload = {
-            "jsonrpc": "2.0",
-            "method": method
-        }
 
-    return payload
+    params is always sent, an empty list is valid JSON-RPC for methods without arguments.
+    The caller's list is copied, so the payload never shares it.
+    """
+    return {
+        "jsonrpc": "2.0",
+        "method": method,
+        "params": list(params) if params else []
+    }
 
 
 def _tip_set_weight(connector: HttpJsonRpcConnector, tipset_key: List[dict]) -> int:
@@ -153,7 +150,7 @@ def _has_obj(connector: HttpJsonRpcConnector, cid: str) -> bool:
     Raises:
         ApiCallError: If the JSON-RPC request fails due to network issues or invalid responses.
     """
-    payload = _make_payload("Filecoin.ChainHasObj", Cid.format_cids_for_json([cid]))
+    payload = _make_payload("Filecoin.ChainHasObj", Cid.format_cid_for_json(cid))
     response = connector.execute(payload)
     return response['result']
 
@@ -235,6 +232,61 @@ def _get_tipset_by_height(connector: HttpJsonRpcConnector, height: int, tipset_k
     return Tipset.from_dict(result['result'])
 
 
+def _iter_tipsets(connector: HttpJsonRpcConnector, start_height: int, count: int, prefetch: int = 2) -> Iterator[Tuple[Tipset, List[BlockMessages]]]:
+    """
+    Walks the chain backwards from a given height, yielding each tipset with the messages of its blocks.
+
+    While the caller processes a tipset, the tipsets at the next `prefetch` heights and their
+    block messages are already being fetched on a thread pool, so the round-trips overlap with
+    the caller's work instead of adding up.  Null rounds (heights without blocks) are skipped.
+
+    Args:
+        connector (HttpJsonRpcConnector): The JSON-RPC connector to use for the API calls.
+        start_height (int): The height of the first tipset to yield.
+        count (int): The number of heights to walk, from `start_height` downwards.
+        prefetch (int): The number of heights fetched ahead of the one being yielded.
+
+    Returns:
+        Iterator[Tuple[Tipset, List[BlockMessages]]]: The tipsets in descending height order, each
+        with the messages of its blocks in the order of the tipset's cids.
+
+    Raises:
+        ValueError: If `count` or `prefetch` is negative.
+    """
+    # checked here rather than in the generator, so a bad argument fails at the call
+    if count < 0:
+        raise ValueError(f"count must not be negative, got {count}.")
+    if prefetch < 0:
+        raise ValueError(f"prefetch must not be negative, got {prefetch}.")
+    return _prefetch_tipsets(connector, start_height, count, prefetch)
+
+
+def _prefetch_tipsets(connector: HttpJsonRpcConnector, start_height: int, count: int, prefetch: int) -> Iterator[Tuple[Tipset, List[BlockMessages]]]:
+    """
+    The generator behind `_iter_tipsets`, which has already checked its arguments.
+    """
+    def fetch(height: int) -> Optional[Tuple[Tipset, List[BlockMessages]]]:
+        tipset = _get_tipset_by_height(connector, height)
+        # a null round resolves to the tipset below it, which is yielded at its own height
+        if tipset.height != height:
+            return None
+        return tipset, [_get_block_messages(connector, cid.id) for cid in tipset.cids]
+
+    heights = range(start_height, max(start_height - count, -1), -1)
+    with ThreadPoolExecutor(max_workers=prefetch + 1) as executor:
+        pending = deque()
+        for height in heights:
+            pending.append(executor.submit(fetch, height))
+            if len(pending) > prefetch:
+                result = pending.popleft().result()
+                if result is not None:
+                    yield result
+        while pending:
+            result = pending.popleft().result()
+            if result is not None:
+                yield result
+
+
 def _get_path(connector: HttpJsonRpcConnector, start_tipset_key: List[dict], end_tipset_key: List[dict]) -> Dict:
     """
     Retrieves the path between two tipsets in the Filecoin blockchain.
@@ -285,7 +337,7 @@ def _get_parent_receipts(connector: HttpJsonRpcConnector, block_cid: str) -> Lis
     Returns:
         List[MessageReceipt]: A list of `MessageReceipt` instances
     """
-    payload = _make_payload("Filecoin.ChainGetParentReceipts", Cid.format_cids_for_json([block_cid]))
+    payload = _make_payload("Filecoin.ChainGetParentReceipts", Cid.format_cid_for_json(block_cid))
     response = connector.execute(payload)
     receipts = []
 
@@ -295,6 +347,26 @@ def _get_parent_receipts(connector: HttpJsonRpcConnector, block_cid: str) -> Lis
 
     return receipts
 
+def _iter_parent_receipts(connector: HttpJsonRpcConnector, block_cid: str) -> Iterator[MessageReceipt]:
+    """
+    Iterates over the parent receipts of a Filecoin block using the given CID.
+
+    A streaming variant of `_get_parent_receipts`.  The receipts are parsed and yielded one at
+    a time as the response is received (requires `ijson`), so the whole response never has to
+    be held in memory.
+
+    Parameters:
+        connector (HttpJsonRpcConnector): An instance of `HttpJsonRpcConnector` to 
+            communicate with the Filecoin node.
+        block_cid (str): The CID of the block whose parent receipts are to be fetched.
+
+    Returns:
+        Iterator[MessageReceipt]: An iterator over `MessageReceipt` instances
+    """
+    payload = _make_payload("Filecoin.ChainGetParentReceipts", Cid.format_cid_for_json(block_cid))
+    return (MessageReceipt.from_dict(dct) for dct in connector.execute_stream(payload))
+
+
 def _get_parent_messages(connector: HttpJsonRpcConnector, block_cid: str) -> List[WrappedMessage]:
     """
     Retrieves the parent messages of a Filecoin block using the given CID.
@@ -312,7 +384,7 @@ def _get_parent_messages(connector: HttpJsonRpcConnector, block_cid: str) -> Lis
         List[WrappedMessage]: A list of `WrappedMessage` instances, each containing a parent 
         message and its corresponding CID.
     """
-    payload = _make_payload("Filecoin.ChainGetParentMessages", Cid.format_cids_for_json([block_cid]))
+    payload = _make_payload("Filecoin.ChainGetParentMessages", Cid.format_cid_for_json(block_cid))
     response = connector.execute(payload)
     wrapped_messages = []
 
@@ -324,6 +396,27 @@ def _get_parent_messages(connector: HttpJsonRpcConnector, block_cid: str) -> Lis
     return wrapped_messages
 
 
+def _iter_parent_messages(connector: HttpJsonRpcConnector, block_cid: str) -> Iterator[WrappedMessage]:
+    """
+    Iterates over the parent messages of a Filecoin block using the given CID.
+
+    A streaming variant of `_get_parent_messages`.  The messages are parsed and yielded one at
+    a time as the response is received (requires `ijson`).
+
+    Parameters:
+        connector (HttpJsonRpcConnector): An instance of `HttpJsonRpcConnector` to 
+            communicate with the Filecoin node.
+        block_cid (str): The CID of the block whose parent messages are to be fetched.
+
+    Returns:
+        Iterator[WrappedMessage]: An iterator over `WrappedMessage` instances, each containing a
+        parent message and its corresponding CID.
+    """
+    payload = _make_payload("Filecoin.ChainGetParentMessages", Cid.format_cid_for_json(block_cid))
+    return (WrappedMessage(Message.from_dict(dct['Message']), Cid.from_dict(dct['Cid']))
+            for dct in connector.execute_stream(payload))
+
+
 def _get_node(connector: HttpJsonRpcConnector, node_path_selector: str) -> dict:
     """
     Fetches specific node data from the Filecoin blockchain using the ChainGetNode RPC method.
@@ -374,6 +467,26 @@ def _get_messages_in_tipset(connector: HttpJsonRpcConnector, tipset_key: List[di
     return messages
 
 
+def _iter_messages_in_tipset(connector: HttpJsonRpcConnector, tipset_key: List[dict]) -> Iterator[Message]:
+    """
+    Iterates over the messages in a Tipset from the Filecoin blockchain using its key.
+
+    A streaming variant of `_get_messages_in_tipset`.  The messages are parsed and yielded one
+    at a time as the response is received (requires `ijson`).
+
+    Args:
+        connector (HttpJsonRpcConnector): An instance of `HttpJsonRpcConnector` used to
+                                          send the JSON-RPC request.
+        tipset_key (List[dict]): A list of dictionaries containing the CIDs of the blocks
+                                 in the Tipset.
+
+    Returns:
+        Iterator[Message]: An iterator over the messages in the Tipset.
+    """
+    payload = _make_payload("Filecoin.ChainGetMessagesInTipset", [tipset_key])
+    return (Message.from_dict(dct['Message']) for dct in connector.execute_stream(payload))
+
+
 def _get_message(connector: HttpJsonRpcConnector, cid: str) -> Message:
     """
     Retrieves a message from the Filecoin blockchain using its CID.
@@ -389,7 +502,7 @@ def _get_message(connector: HttpJsonRpcConnector, cid: str) -> Message:
     Returns:
         Message: An instance of `Message` representing the retrieved message.
     """
-    payload = _make_payload("Filecoin.ChainGetMessage", Cid.format_cids_for_json([cid]))
+    payload = _make_payload("Filecoin.ChainGetMessage", Cid.format_cid_for_json(cid))
     result = connector.execute(payload)
     return Message.from_dict(result['result'])
 
@@ -409,7 +522,7 @@ def _get_genesis(connector: HttpJsonRpcConnector) -> Tipset:
         Tipset: An instance of `Tipset` representing the genesis block of the blockchain.
     """
     payload = _make_payload("Filecoin.ChainGetGenesis", None)
-    data = connector.execute(payload, debug=True)
+    data = connector.execute(payload)
     genesis_tipset = Tipset.from_dict(data['result'])
     return genesis_tipset
 
@@ -430,8 +543,8 @@ def _delete_obj(connector: HttpJsonRpcConnector, cid: str) -> bool:
         bool: True if the operation to delete the local copy was reported as successful by the node, otherwise False.
 
     """
-    payload = _make_payload("Filecoin.ChainDeleteObj", Cid.format_cids_for_json([cid]))
-    dct_result = connector.execute(payload, debug=True)
+    payload = _make_payload("Filecoin.ChainDeleteObj", Cid.format_cid_for_json(cid))
+    dct_result = connector.execute(payload)
 
     if 'error' in dct_result:
         return False
@@ -476,7 +589,7 @@ def _get_block_messages(connector: HttpJsonRpcConnector, block_cid: str) -> Bloc
     Raises:
         Exception: If the JSON-RPC request fails or the response is invalid.
     """  
-    payload = _make_payload("Filecoin.ChainGetBlockMessages", Cid.format_cids_for_json([block_cid]))  
+    payload = _make_payload("Filecoin.ChainGetBlockMessages", Cid.format_cid_for_json(block_cid))  
     response = connector.execute(payload)  
 
     if 'result' not in response:
@@ -527,7 +640,7 @@ def _read_obj(connector: HttpJsonRpcConnector, cid: str) -> str:
         typically in CBOR (Concise Binary Object Representation) format and may require 
         further decoding and interpretation depending on its structure and context.
     """
-    payload = _make_payload("Filecoin.ChainReadObj", Cid.format_cids_for_json([cid]))
+    payload = _make_payload("Filecoin.ChainReadObj", Cid.format_cid_for_json(cid))
     result = connector.execute(payload)
     return result['result']
 
@@ -549,7 +662,7 @@ def _head(connector: HttpJsonRpcConnector) -> Tipset:
         ApiCallError: If the RPC call fails, an ApiCallError is raised containing the error details.
 
     Examples:
-        >>> current_chain_head = _get_chain_head(connector)
+        >>> current_chain_head = _head(connector)
         >>> print(current_chain_head.height)
         >>> for header in current_chain_head.block_headers:
         ...     print(header.miner)
@@ -582,16 +695,11 @@ def _get_block(connector: HttpJsonRpcConnector, cid: str) -> BlockHeader:
         >>> print(block_header)
 
     Note:
-        The `debug` parameter is set to `True`, which will print the JSON-RPC request and
-        response payload to stdout. Set this to `False` in production environments to avoid
-        leaking sensitive information.
+        The request and response are logged to the 'pylotus_rpc.http_json_rpc_connector'
+        logger when it is enabled for DEBUG.
     """
     
-    payload = {
-        "jsonrpc": "2.0",
-        "method": "Filecoin.ChainGetBlock",
-        "params": Cid.format_cids_for_json([cid])
-    }
+    payload = _make_payload("Filecoin.ChainGetBlock", Cid.format_cid_for_json(cid))
 
-    result = connector.execute(payload, debug=False)["result"]
+    result = connector.execute(payload)["result"]
     return BlockHeader.from_dict(result)
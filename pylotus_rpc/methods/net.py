@@ -0,0 +1,58 @@
+from typing import List
+from ..http_json_rpc_connector import HttpJsonRpcConnector
+from ..types.address_info import AddressInfo
+
+def _make_payload(method: str, params: List):
+    """
+    Internal utility method to generate a JSON-RPC payload for a given method and parameters.
+
+    params is always sent, an empty list is valid JSON-RPC for methods without arguments.
+    """
+    return {
+        "jsonrpc": "2.0",
+        "method": method,
+        "params": params if params else []
+    }
+
+
+def _result(payload: dict, response: dict):
+    """
+    Internal utility method to extract the result of a JSON-RPC response.
+
+    Raises HttpJsonRpcConnector.ApiCallError when the node answered with an error, rather than
+    leaving the caller with a KeyError on the missing 'result' member.
+    """
+    if 'error' in response:
+        raise HttpJsonRpcConnector.ApiCallError(payload["method"], 200, response['error'].get('message'))
+    return response['result']
+
+
+def _addrs_listen(connector: HttpJsonRpcConnector) -> AddressInfo:
+    """
+    Retrieves the peer ID of the node and the multiaddresses it is listening on.
+
+    Args:
+        connector (HttpJsonRpcConnector): The connector used to communicate with the Filecoin node via JSON-RPC.
+
+    Returns:
+        AddressInfo: The peer ID and listen addresses of the node.
+    """
+    payload = _make_payload("Filecoin.NetAddrsListen", None)
+    response = connector.execute(payload)
+    return AddressInfo.from_dict(_result(payload, response))
+
+
+def _agent_version(connector: HttpJsonRpcConnector, peer_id: str) -> str:
+    """
+    Retrieves the agent version reported by a connected peer.
+
+    Args:
+        connector (HttpJsonRpcConnector): The connector used to communicate with the Filecoin node via JSON-RPC.
+        peer_id (str): The libp2p peer ID of the peer.
+
+    Returns:
+        str: The agent version string of the peer, e.g. "lotus-1.25.0+mainnet".
+    """
+    payload = _make_payload("Filecoin.NetAgentVersion", [peer_id])
+    response = connector.execute(payload)
+    return _result(payload, response)
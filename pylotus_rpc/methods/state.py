@@ -1,4 +1,4 @@
-from typing import Optional, List, Tuple, Dict
+from typing import Optional, List, Tuple, Dict, Iterator
 from ..http_json_rpc_connector import HttpJsonRpcConnector
 from ..types.block_header import BlockHeader
 from ..types.cid import Cid
@@ -63,35 +63,31 @@ def _make_payload(method: str, params: List, tipset: Optional[Tipset] = None, in
 
     Args:
         method (str): The name of the JSON-RPC method to call.
-        params (List): A list of parameters to pass to the method.
-        tipset (Optional[Tipset]): The tipset at which to call the method. If None, the la tipset is used.
+        params (List): A list of parameters to pass to the method. The list is copied, never modified.
+        tipset (Optional[Tipset]): The tipset at which to call the method. If None, the latest tipset is used.
+        include_tipset (bool): Whether the tipset key should be appended to the parameters.
 
     Returns:
         dict: A dictionary containing the JSON-RPC payload.
 
     """
-    cids = None
-    if tipset:
-        cids = tipset.get_tip_set_key()
-
-    # if params exists (including if it's an empty list), append the cids, unless
-    # we are told not too (a few routines don't accept at tipset parameter)
-    if params is not None and include_tipset:
-        params.append(cids)
-
-    if params: 
-        payload = {
-            "jsonrpc": "2.0",
-            "method": method,
-            "params": params
-        }
+    if params is None:
+        params = []
     else:
-        payload = {
-            "jsonrpc": "2.0",
-            "method": method
-        }
+        # copy the caller's list, appending the tipset key must not modify it
+        params = list(params)
+
+        # append the tipset key (None selects the chain head), unless we are told
+        # not to (a few routines don't accept a tipset parameter)
+        if include_tipset:
+            params.append(tipset.get_tip_set_key() if tipset else None)
 
-    return payload
+    # params is always sent, an empty list is valid JSON-RPC for methods without arguments
+    return {
+        "jsonrpc": "2.0",
+        "method": method,
+        "params": params
+    }
 
 
 def _all_miner_faults(connector: HttpJsonRpcConnector, lookback_epochs: int, tipset: Optional[Tipset] = None):
@@ -474,7 +470,7 @@ def _search_message(connector: HttpJsonRpcConnector, cid: str) -> MessageLookup:
         MessageNotFound: If the message with the given CID cannot be found or if there's an error
                          in retrieving the message from the Filecoin network.
     """
-    payload = _make_payload("Filecoin.StateSearchMsg", Cid.format_cids_for_json([cid]), include_tipset=False)
+    payload = _make_payload("Filecoin.StateSearchMsg", Cid.format_cid_for_json(cid), include_tipset=False)
     dct_data = connector.execute(payload)
 
     # raise an exception if the message can't be found / loaded
@@ -499,15 +495,10 @@ def _replay(connector: HttpJsonRpcConnector, cid: str, tipset: Optional[Tipset]
     Returns:
         InvocationResult: An instance of InvocationResult containing the result of the message execution.
     """
-    tipset_key = []
-    if tipset:
-        tipset_key = tipset.get_tip_set_key()
-
-    payload = {
-        "jsonrpc": "2.0",
-        "method": "Filecoin.StateReplay",
-        "params": [tipset_key, {"/": cid}]
-    }
+    # StateReplay takes the tipset key before the message cid, so it is passed explicitly
+    # (None selects the chain head, like the tipset key appended for other state calls)
+    tipset_key = tipset.get_tip_set_key() if tipset else None
+    payload = _make_payload("Filecoin.StateReplay", [tipset_key, {"/": cid}], include_tipset=False)
     dct_data = connector.execute(payload)
 
     # raise an exception if the message can't be found / loaded
@@ -555,10 +546,7 @@ def _network_name(connector: HttpJsonRpcConnector) -> str:
     Raises:
         HTTPError: If the request to the Filecoin node fails.
     """
-    payload = {
-            "jsonrpc": "2.0",
-            "method": "Filecoin.StateNetworkName"
-    }
+    payload = _make_payload("Filecoin.StateNetworkName", [], include_tipset=False)
     dct_data = connector.execute(payload)
     return dct_data['result']
 
@@ -1083,7 +1071,7 @@ def _get_randomness_from_tickets(
         domain_tag: int, 
         epoch: int, 
         entropy_base64: str, 
-        tipset: Tipset) -> str:
+        tipset: Optional[Tipset] = None) -> str:
     """
     Retrieves randomness for a given domain tag, epoch, and entropy from the chain's ticket chain.
 
@@ -1097,7 +1085,8 @@ def _get_randomness_from_tickets(
         domain_tag (int): An identifier for the domain separation tag, categorizing the use of randomness.
         epoch (int): The epoch number for which to retrieve the randomness.
         entropy_base64 (str): Base64 encoded entropy string to further randomize the output.
-        tipset (Tipset): The tipset at which to query the randomness.
+        tipset (Optional[Tipset]): The tipset at which to query the randomness. If None, the node
+            resolves the chain head itself, so no separate head request is needed.
 
     Returns:
         str: A base64 encoded string representing the derived randomness.
@@ -1397,3 +1386,22 @@ def _list_actors(connector, tipset) -> List[str]:
     lst_actors = dct_result.get("result", [])
 
     return lst_actors
+
+
+def _iter_actors(connector: HttpJsonRpcConnector, tipset: Optional[Tipset] = None) -> Iterator[str]:
+    """
+    Iterates over the addresses of all actors in a specified tipset.
+
+    A streaming variant of `_list_actors`.  The response of `StateListActors` can contain
+    millions of addresses, so instead of loading it as a whole the addresses are parsed and
+    yielded one at a time as the response is received (requires `ijson`).
+
+    Args:
+        connector (HttpJsonRpcConnector): An instance of HttpJsonRpcConnector for making API requests.
+        tipset (Optional[Tipset]): The tipset at which to list actors. If None, the latest tipset is used.
+
+    Returns:
+        Iterator[str]: An iterator over the actor addresses present in the specified tipset.
+    """
+    payload = _make_payload("Filecoin.StateListActors", [], tipset)
+    return connector.execute_stream(payload)
@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+from typing import Dict, List
+
+
+@dataclass
+class AddressInfo:
+    """
+    Represents the peer ID of a node along with the multiaddresses it listens on.
+
+    Attributes:
+    - peer_id: The libp2p peer ID of the node.
+    - addrs: The multiaddresses the node is listening on.
+    """
+    __slots__ = ("peer_id", "addrs")
+
+    peer_id: str
+    addrs: List[str]
+
+    @staticmethod
+    def from_dict(data: Dict) -> 'AddressInfo':
+        """
+        Deserialize a dictionary (from parsed JSON) into an AddressInfo object.
+
+        Args:
+        - data: A dictionary representation of the AddressInfo object.
+
+        Returns:
+        An instance of the AddressInfo class.
+        """
+        return AddressInfo(
+            peer_id=data["ID"],
+            addrs=data["Addrs"] or []
+        )
@@ -26,6 +26,25 @@ class BlockHeader:
     - fork_signaling: Fork signaling number.
     - parent_base_fee: Parent base fee.
     """
+    __slots__ = (
+        "miner",
+        "ticket",
+        "election_proof",
+        "beacon_entries",
+        "win_post_proof",
+        "parents",
+        "parent_weight",
+        "height",
+        "parent_state_root",
+        "parent_message_receipts",
+        "messages",
+        "bls_aggregate",
+        "timestamp",
+        "block_sig",
+        "fork_signaling",
+        "parent_base_fee",
+    )
+
     miner: str
     ticket: Dict[str, str]
     election_proof: Dict[str, Union[int, str]]
@@ -15,6 +15,8 @@ class BlockMessages:
     - secpk_messages: A list of Secp256k1 signature messages.
     - cids: A list of content identifiers (CIDs) associated with the block messages.
     """
+    __slots__ = ("bls_messages", "secpk_messages", "cids")
+
     bls_messages: List[Message]
     secpk_messages: List[SignedMessage]
     cids: List[Cid]
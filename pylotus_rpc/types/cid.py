@@ -9,6 +9,8 @@ class Cid:
     Attributes:
     - cid_id: A string representing the value of the CID.
     """
+    __slots__ = ("id",)
+
     id: str
 
     def __str__(self) -> str:
@@ -32,6 +34,23 @@ class Cid:
         return Cid(dct.get('/'))
 
 
+    @staticmethod
+    def format_cid_for_json(cid: str) -> List[Dict[str, str]]:
+        """
+        Formats a single CID string as a JSON-RPC params list.
+
+        Equivalent to `format_cids_for_json([cid])`, without building the intermediate list
+        and running the comprehension for the common single-CID call.
+
+        Args:
+            cid: The CID string to be formatted.
+
+        Returns:
+            A list holding the dictionary representing the CID in the required JSON format.
+        """
+        return [{"/": cid}]
+
+
     @staticmethod
     def format_cids_for_json(lst_cids: List[str]) -> List[Dict[str, str]]:
         """
@@ -12,6 +12,8 @@ class MessageReceipt:
     - gas_used: The amount of gas used to process the message.
     """
     
+    __slots__ = ("exit_code", "return_value", "gas_used")
+
     exit_code: int
     return_value: Any
     gas_used: int
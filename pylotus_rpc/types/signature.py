@@ -9,6 +9,8 @@ class Signature:
     - type: An integer representing the signature type.
     - data: A string containing the signature data.
     """
+    __slots__ = ("type", "data")
+
     type: int
     data: str
 
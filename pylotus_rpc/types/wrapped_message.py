@@ -11,5 +11,7 @@ class WrappedMessage:
         message (Message): The Filecoin message.
         cid (Cid): The Content Identifier (CID) for the message.
     """
+    __slots__ = ("message", "cid")
+
     message: Message
     cid: Cid
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import socket
+
+import pytest
+
+from pylotus_rpc.http_json_rpc_connector import HttpJsonRpcConnector
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web
+from pylotus_rpc.async_http_json_rpc_connector import AsyncHttpJsonRpcConnector
+
+
+async def _rpc_handler(request):
+    """
+    Answers with the method name as result; 'FAIL' gets a 500, 'SLOW' is answered last.
+    """
+    data = await request.json()
+    if data["method"] == "FAIL":
+        return web.Response(status=500, text="internal error")
+    if data["method"] == "SLOW":
+        await asyncio.sleep(0.1)
+    return web.json_response({"jsonrpc": "2.0", "id": data["id"], "result": data["method"]})
+
+
+def _run_with_node(test):
+    """
+    Runs `test(connector)` against a local aiohttp server standing in for a node.
+    """
+    async def main():
+        app = web.Application()
+        app.router.add_post("/rpc/v0", _rpc_handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            async with AsyncHttpJsonRpcConnector(host=f"http://127.0.0.1:{port}/rpc/v0") as connector:
+                return await test(connector)
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(main())
+
+
+def _unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_execute_assigns_ids():
+    async def test(connector):
+        first = {"jsonrpc": "2.0", "method": "A", "params": []}
+        second = {"jsonrpc": "2.0", "method": "B", "params": []}
+        responses = [await connector.execute(first), await connector.execute(second)]
+        return first, second, responses
+
+    first, second, responses = _run_with_node(test)
+    assert first["id"] != second["id"]
+    assert [response["id"] for response in responses] == [first["id"], second["id"]]
+    assert [response["result"] for response in responses] == ["A", "B"]
+
+
+def test_execute_raises_on_non_200():
+    async def test(connector):
+        with pytest.raises(HttpJsonRpcConnector.ApiCallError) as excinfo:
+            await connector.execute({"jsonrpc": "2.0", "method": "FAIL", "params": []})
+        return excinfo.value
+
+    error = _run_with_node(test)
+    assert error.status_code == 500
+    assert error.message == "internal error"
+
+
+def test_execute_wraps_network_errors():
+    async def main():
+        async with AsyncHttpJsonRpcConnector(host=f"http://127.0.0.1:{_unused_port()}/rpc/v0") as connector:
+            with pytest.raises(HttpJsonRpcConnector.ApiCallError) as excinfo:
+                await connector.execute({"jsonrpc": "2.0", "method": "A", "params": []})
+            return excinfo.value
+
+    error = asyncio.run(main())
+    assert error.status_code == 0
+    assert error.method_name == "A"
+
+
+def test_execute_many_keeps_request_order():
+    async def test(connector):
+        # the first request is answered last
+        return await connector.execute_many([{"jsonrpc": "2.0", "method": method, "params": []}
+                                             for method in ("SLOW", "A", "B")])
+
+    responses = _run_with_node(test)
+    assert [response["result"] for response in responses] == ["SLOW", "A", "B"]
+
+
+def _run_with_http2_transport(handler, test):
+    """
+    Runs `test(connector)` on an HTTP/2 connector whose requests are answered by an httpx
+    mock transport.
+    """
+    httpx = pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+
+    async def main():
+        async with AsyncHttpJsonRpcConnector(host="http://localhost:1234/rpc/v0", http2=True) as connector:
+            connector._session = httpx.AsyncClient(transport=httpx.MockTransport(handler),
+                                                   headers=connector.get_request_headers())
+            connector._semaphore = asyncio.Semaphore(4)
+            return await test(connector)
+
+    return asyncio.run(main())
+
+
+async def _echo_method(request):
+    """
+    Answers with the method name as result; 'SLOW' is answered last.
+    """
+    import httpx
+    data = json.loads(request.content)
+    if data["method"] == "SLOW":
+        await asyncio.sleep(0.1)
+    return httpx.Response(200, json={"jsonrpc": "2.0", "id": data["id"], "result": data["method"]})
+
+
+def test_http2_execute():
+    async def test(connector):
+        return await connector.execute({"jsonrpc": "2.0", "method": "A", "params": []})
+
+    assert _run_with_http2_transport(_echo_method, test)["result"] == "A"
+
+
+def test_http2_execute_raises_on_non_200():
+    httpx = pytest.importorskip("httpx")
+
+    async def test(connector):
+        with pytest.raises(HttpJsonRpcConnector.ApiCallError) as excinfo:
+            await connector.execute({"jsonrpc": "2.0", "method": "A", "params": []})
+        return excinfo.value
+
+    error = _run_with_http2_transport(lambda request: httpx.Response(503, text="unavailable"), test)
+    assert error.status_code == 503
+    assert error.message == "unavailable"
+
+
+def test_http2_execute_wraps_network_errors():
+    httpx = pytest.importorskip("httpx")
+
+    def refuse(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    async def test(connector):
+        with pytest.raises(HttpJsonRpcConnector.ApiCallError) as excinfo:
+            await connector.execute({"jsonrpc": "2.0", "method": "A", "params": []})
+        return excinfo.value
+
+    assert _run_with_http2_transport(refuse, test).status_code == 0
+
+
+def test_http2_execute_many_keeps_request_order():
+    async def test(connector):
+        # the first request is answered last
+        return await connector.execute_many([{"jsonrpc": "2.0", "method": method, "params": []}
+                                             for method in ("SLOW", "A", "B")])
+
+    responses = _run_with_http2_transport(_echo_method, test)
+    assert [response["result"] for response in responses] == ["SLOW", "A", "B"]
+    assert len({response["id"] for response in responses}) == 3
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from pylotus_rpc.async_lotus_client import AsyncLotusClient
+
+
+class StubAsyncConnector:
+    def __init__(self):
+        self.payloads = []
+
+    async def execute(self, payload, debug=False):
+        self.payloads.append(payload)
+        return {"jsonrpc": "2.0", "result": "7"}
+
+
+def test_calls_are_awaited_on_the_connector():
+    stub = StubAsyncConnector()
+    client = AsyncLotusClient(stub)
+
+    async def main():
+        return await asyncio.gather(client.Chain.tip_set_weight([{"/": "a"}]),
+                                    client.Chain.tip_set_weight([{"/": "b"}]))
+
+    assert asyncio.run(main()) == [7, 7]
+    assert [payload["params"] for payload in stub.payloads] == [[[{"/": "a"}]], [[{"/": "b"}]]]
+
+
+def test_streaming_methods_are_rejected():
+    client = AsyncLotusClient(StubAsyncConnector())
+
+    with pytest.raises(TypeError):
+        client.State.iter_actors
+    with pytest.raises(TypeError):
+        client.Chain.iter_tipsets
+    with pytest.raises(AttributeError):
+        client.Chain.no_such_method
@@ -6,6 +6,7 @@ from pylotus_rpc.types.cid import Cid
 
 from pylotus_rpc.methods.chain import (
     _head,
+    _make_payload,
     _get_tip_set,
     _read_obj,
     _get_block_messages,
@@ -20,6 +21,10 @@ from pylotus_rpc.methods.chain import (
     _get_randomness_from_beacon,
     _get_randomness_from_tickets,
     _has_obj,
+    _iter_messages_in_tipset,
+    _iter_parent_messages,
+    _iter_parent_receipts,
+    _iter_tipsets,
     _tip_set_weight
 )
 
@@ -87,6 +92,51 @@ def test_get_tipset_by_height(setup_connector):
     assert tipset.height == 3354396
 
 
+@pytest.mark.integration
+def test_iter_tipsets(setup_connector):
+    lst_tipsets = list(_iter_tipsets(setup_connector, 3354396, 3))
+    assert 0 < len(lst_tipsets) <= 3
+    assert lst_tipsets[0][0].height == 3354396
+    for tipset, lst_block_messages in lst_tipsets:
+        assert len(lst_block_messages) == len(tipset.cids)
+
+
+def test_make_payload_copies_params():
+    params = [[{"/": "bafy"}]]
+    first = _make_payload("Filecoin.ChainTipSetWeight", params)
+    second = _make_payload("Filecoin.ChainTipSetWeight", params)
+    first["params"].append(None)
+
+    assert params == [[{"/": "bafy"}]]
+    assert second["params"] == [[{"/": "bafy"}]]
+
+
+def test_iter_tipsets_skips_null_rounds():
+    class StubConnector:
+        def execute(self, payload, debug=False):
+            if payload["method"] == "Filecoin.ChainGetTipSetByHeight":
+                height = payload["params"][0]
+                # height 8 is a null round, the node answers with the tipset below it
+                if height == 8:
+                    height = 7
+                return {"result": {"Height": height, "Cids": [{"/": f"bafy{height}"}], "Blocks": []}}
+            return {"result": {"BlsMessages": [], "SecpkMessages": [], "Cids": []}}
+
+    lst_tipsets = list(_iter_tipsets(StubConnector(), 10, 4))
+    assert [tipset.height for tipset, _ in lst_tipsets] == [10, 9, 7]
+    assert all(len(lst_block_messages) == 1 for _, lst_block_messages in lst_tipsets)
+
+
+@pytest.mark.parametrize("count, prefetch", [(-1, 2), (3, -1)])
+def test_iter_tipsets_rejects_negative_arguments(count, prefetch):
+    class StubConnector:
+        def execute(self, payload, debug=False):
+            pytest.fail("request sent")
+
+    with pytest.raises(ValueError, match="must not be negative"):
+        _iter_tipsets(StubConnector(), 10, count, prefetch)
+
+
 @pytest.mark.integration
 def test_get_parent_receipts(setup_connector):
     test_tipset = _head(setup_connector)
@@ -95,6 +145,25 @@ def test_get_parent_receipts(setup_connector):
     assert len(parent_receipts) > 0
 
 
+@pytest.mark.integration
+def test_iter_parent_receipts(setup_connector):
+    test_tipset = _head(setup_connector)
+    parent_receipts = list(_iter_parent_receipts(setup_connector, test_tipset.cids[0].id))
+    assert len(parent_receipts) == len(_get_parent_receipts(setup_connector, test_tipset.cids[0].id))
+
+
+def test_iter_parent_receipts_parses_streamed_items():
+    class StubConnector:
+        def execute_stream(self, payload, prefix="result.item", debug=False):
+            assert payload["method"] == "Filecoin.ChainGetParentReceipts"
+            yield {"ExitCode": 0, "Return": None, "GasUsed": 10}
+            yield {"ExitCode": 16, "Return": None, "GasUsed": 20}
+
+    parent_receipts = list(_iter_parent_receipts(StubConnector(), "bafy"))
+    assert [receipt.exit_code for receipt in parent_receipts] == [0, 16]
+    assert [receipt.gas_used for receipt in parent_receipts] == [10, 20]
+
+
 @pytest.mark.integration
 def test_get_parent_messages(setup_connector):
     test_tipset = _head(setup_connector)
@@ -103,6 +172,13 @@ def test_get_parent_messages(setup_connector):
     assert len(parent_messages) > 0
 
 
+@pytest.mark.integration
+def test_iter_parent_messages(setup_connector):
+    test_tipset = _head(setup_connector)
+    parent_messages = list(_iter_parent_messages(setup_connector, test_tipset.cids[0].id))
+    assert len(parent_messages) == len(_get_parent_messages(setup_connector, test_tipset.cids[0].id))
+
+
 @pytest.mark.integration
 def test_get_node(setup_connector):
     test_tipset = _head(setup_connector)
@@ -119,6 +195,13 @@ def test_get_messages_in_tipset(setup_connector):
     assert messages is not None
     assert len(messages) > 0
 
+
+@pytest.mark.integration
+def test_iter_messages_in_tipset(setup_connector):
+    test_tipset = _head(setup_connector)
+    messages = list(_iter_messages_in_tipset(setup_connector, test_tipset.get_tip_set_key()))
+    assert len(messages) == len(_get_messages_in_tipset(setup_connector, test_tipset.get_tip_set_key()))
+
 @pytest.mark.integration
 def test_get_message(setup_connector):
     # get the tipset
@@ -0,0 +1,236 @@
+import json
+
+import pytest
+import requests
+
+from pylotus_rpc.http_json_rpc_connector import HttpJsonRpcConnector
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.status_code = status_code
+        self.content = json.dumps(data).encode()
+        self.text = self.content.decode()
+
+
+def _connector_answering(monkeypatch, answer):
+    """
+    Returns a connector whose requests are answered by `answer(request)` instead of a node.
+    """
+    connector = HttpJsonRpcConnector(host="http://localhost:1234/rpc/v0")
+    monkeypatch.setattr(connector, "_post", lambda body: FakeResponse(answer(json.loads(body))))
+    return connector
+
+
+def test_endpoint_is_rebuilt_when_a_part_changes():
+    connector = HttpJsonRpcConnector(host="http://localhost:1234/rpc/v0")
+    assert connector.get_rpc_endpoint() == "http://localhost:1234/rpc/v0"
+
+    connector.host = "node.example"
+    connector.port = 4321
+    connector.path = "/rpc/v1"
+    assert connector.get_rpc_endpoint() == "http://node.example:4321/rpc/v1"
+
+
+def test_api_token_updates_session_headers():
+    connector = HttpJsonRpcConnector(host="http://localhost:1234/rpc/v0")
+    assert "Authorization" not in connector._session.headers
+
+    connector.api_token = "token"
+    assert connector.get_request_headers()["Authorization"] == "Bearer token"
+    assert connector._session.headers["Authorization"] == "Bearer token"
+
+    connector.api_token = None
+    assert "Authorization" not in connector.get_request_headers()
+    assert "Authorization" not in connector._session.headers
+
+
+def test_async_endpoint_is_rebuilt_when_a_part_changes():
+    pytest.importorskip("aiohttp")
+    from pylotus_rpc.async_http_json_rpc_connector import AsyncHttpJsonRpcConnector
+
+    connector = AsyncHttpJsonRpcConnector(host="http://localhost:1234/rpc/v0")
+    assert connector.get_rpc_endpoint() == "http://localhost:1234/rpc/v0"
+
+    connector.port = 4321
+    connector.api_token = "token"
+    assert connector.get_rpc_endpoint() == "http://localhost:4321/rpc/v0"
+    assert connector.get_request_headers()["Authorization"] == "Bearer token"
+
+
+def test_execute_batch_matches_responses_by_id(monkeypatch):
+    # the node may answer a batch in any order
+    connector = _connector_answering(monkeypatch, lambda requests: [
+        {"jsonrpc": "2.0", "id": request["id"], "result": request["method"]} for request in reversed(requests)
+    ])
+
+    responses = connector.execute_batch([{"jsonrpc": "2.0", "method": method, "params": []}
+                                         for method in ("A", "B", "C")])
+    assert [response["result"] for response in responses] == ["A", "B", "C"]
+
+
+def test_execute_batch_fills_in_missing_responses(monkeypatch):
+    connector = _connector_answering(monkeypatch, lambda requests: [
+        {"jsonrpc": "2.0", "id": requests[0]["id"], "result": "A"}
+    ])
+
+    responses = connector.execute_batch([{"jsonrpc": "2.0", "method": method, "params": []}
+                                         for method in ("A", "B")])
+    assert responses[0]["result"] == "A"
+    assert "error" in responses[1]
+
+
+def test_execute_batch_rejects_a_single_object_reply(monkeypatch):
+    connector = _connector_answering(monkeypatch, lambda requests: {
+        "jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "invalid request"}
+    })
+
+    with pytest.raises(HttpJsonRpcConnector.ApiCallError):
+        connector.execute_batch([{"jsonrpc": "2.0", "method": "A", "params": []}])
+
+
+def test_execute_batch_of_nothing_sends_nothing(monkeypatch):
+    connector = _connector_answering(monkeypatch, lambda requests: pytest.fail("request sent"))
+    assert connector.execute_batch([]) == []
+
+
+class FakeStreamResponse:
+    def __init__(self, body: bytes, status_code=200, error=None):
+        self.status_code = status_code
+        self.text = body.decode()
+        self._body = body
+        self._error = error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def iter_content(self, chunk_size):
+        # hand the body over in small pieces, as a slow socket would
+        for start in range(0, len(self._body), 7):
+            yield self._body[start:start + 7]
+        # the connection breaks once the whole body has been handed over
+        if self._error is not None:
+            raise self._error
+
+
+def _streaming_connector(monkeypatch, data, status_code=200, error=None):
+    pytest.importorskip("ijson")
+    connector = HttpJsonRpcConnector(host="http://localhost:1234/rpc/v0")
+    body = data if isinstance(data, bytes) else json.dumps(data).encode()
+    monkeypatch.setattr(connector._session, "post",
+                        lambda *args, **kwargs: FakeStreamResponse(body, status_code, error))
+    return connector
+
+
+def test_execute_stream_yields_result_items(monkeypatch):
+    connector = _streaming_connector(monkeypatch, {"jsonrpc": "2.0", "id": 1, "result": ["f01", "f02", "f03"]})
+    assert list(connector.execute_stream({"jsonrpc": "2.0", "method": "A", "params": []})) == ["f01", "f02", "f03"]
+
+
+def test_execute_stream_reports_error_members(monkeypatch):
+    connector = _streaming_connector(monkeypatch, {"jsonrpc": "2.0", "id": 1, "error": {"code": 1, "message": "boom"}})
+
+    with pytest.raises(HttpJsonRpcConnector.ApiCallError) as excinfo:
+        list(connector.execute_stream({"jsonrpc": "2.0", "method": "A", "params": []}))
+    assert excinfo.value.message == "boom"
+
+
+def test_execute_stream_reports_http_errors(monkeypatch):
+    connector = _streaming_connector(monkeypatch, {"message": "unavailable"}, status_code=503)
+
+    with pytest.raises(HttpJsonRpcConnector.ApiCallError) as excinfo:
+        list(connector.execute_stream({"jsonrpc": "2.0", "method": "A", "params": []}))
+    assert excinfo.value.status_code == 503
+
+
+def test_execute_stream_parses_numbers_like_execute(monkeypatch):
+    connector = _streaming_connector(monkeypatch, {"jsonrpc": "2.0", "id": 1, "result": [1, 2.5]})
+
+    items = list(connector.execute_stream({"jsonrpc": "2.0", "method": "A", "params": []}))
+    assert items == [1, 2.5]
+    assert type(items[1]) is float
+
+
+def test_execute_stream_reports_errors_while_reading(monkeypatch):
+    # the connection drops after the first items have been received
+    body = b'{"jsonrpc": "2.0", "id": 1, "result": ["f01", "f02", '
+    connector = _streaming_connector(monkeypatch, body, error=requests.exceptions.ChunkedEncodingError("connection reset"))
+
+    items = []
+    with pytest.raises(HttpJsonRpcConnector.ApiCallError) as excinfo:
+        for item in connector.execute_stream({"jsonrpc": "2.0", "method": "A", "params": []}):
+            items.append(item)
+    assert items == ["f01", "f02"]
+    assert excinfo.value.status_code == 0
+
+
+def test_execute_stream_reports_truncated_bodies(monkeypatch):
+    connector = _streaming_connector(monkeypatch, b'{"jsonrpc": "2.0", "id": 1, "result": ["f01", "f0')
+
+    with pytest.raises(HttpJsonRpcConnector.ApiCallError):
+        list(connector.execute_stream({"jsonrpc": "2.0", "method": "A", "params": []}))
+
+
+def _http2_connector(handler):
+    """
+    Returns an HTTP/2 connector whose requests are answered by an httpx mock transport.
+    """
+    httpx = pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    connector = HttpJsonRpcConnector(host="http://localhost:1234/rpc/v0", http2=True)
+    connector._session = httpx.Client(transport=httpx.MockTransport(handler), headers=connector.get_request_headers())
+    return connector
+
+
+def test_http2_execute():
+    httpx = pytest.importorskip("httpx")
+
+    def echo_method(request):
+        data = json.loads(request.content)
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": data["id"], "result": data["method"]})
+
+    connector = _http2_connector(echo_method)
+    assert connector.execute({"jsonrpc": "2.0", "method": "A", "params": []})["result"] == "A"
+
+
+def test_http2_execute_raises_on_non_200():
+    httpx = pytest.importorskip("httpx")
+    connector = _http2_connector(lambda request: httpx.Response(503, text="unavailable"))
+
+    with pytest.raises(HttpJsonRpcConnector.ApiCallError) as excinfo:
+        connector.execute({"jsonrpc": "2.0", "method": "A", "params": []})
+    assert excinfo.value.status_code == 503
+    assert excinfo.value.message == "unavailable"
+
+
+def test_http2_execute_wraps_network_errors():
+    httpx = pytest.importorskip("httpx")
+
+    def refuse(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    connector = _http2_connector(refuse)
+    with pytest.raises(HttpJsonRpcConnector.ApiCallError) as excinfo:
+        connector.execute({"jsonrpc": "2.0", "method": "A", "params": []})
+    assert excinfo.value.status_code == 0
+
+
+def test_http2_execute_stream():
+    pytest.importorskip("ijson")
+    httpx = pytest.importorskip("httpx")
+    connector = _http2_connector(lambda request: httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": ["f01", "f02"]}))
+    assert list(connector.execute_stream({"jsonrpc": "2.0", "method": "A", "params": []})) == ["f01", "f02"]
+
+
+def test_http2_execute_stream_raises_on_non_200():
+    pytest.importorskip("ijson")
+    httpx = pytest.importorskip("httpx")
+    connector = _http2_connector(lambda request: httpx.Response(503, text="unavailable"))
+
+    with pytest.raises(HttpJsonRpcConnector.ApiCallError) as excinfo:
+        list(connector.execute_stream({"jsonrpc": "2.0", "method": "A", "params": []}))
+    assert excinfo.value.status_code == 503
+    assert excinfo.value.message == "unavailable"
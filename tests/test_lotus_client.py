@@ -0,0 +1,266 @@
+import copy
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+
+from pylotus_rpc.lotus_client import LotusClient, _is_cacheable
+from pylotus_rpc.types.cid import Cid
+from pylotus_rpc.types.tip_set import Tipset
+
+
+TIPSET_KEY = [{"/": "bafy2bzacea"}]
+
+
+class StubConnector:
+    """
+    Answers every request with a response built by `handler`, and records the payloads sent.
+    """
+    def __init__(self, handler=None):
+        self.handler = handler or (lambda payload: {"jsonrpc": "2.0", "result": "1"})
+        self.payloads = []
+        self.batches = []
+
+    def execute(self, payload, debug=False):
+        self.payloads.append(payload)
+        return self.handler(payload)
+
+    def execute_batch(self, payloads, debug=False):
+        self.batches.append(payloads)
+        return [self.handler(payload) for payload in payloads]
+
+    def execute_stream(self, payload, prefix="result.item", debug=False):
+        self.payloads.append(payload)
+        return iter(["f01", "f02"])
+
+
+def _payload(method, params):
+    return {"jsonrpc": "2.0", "method": method, "params": params}
+
+
+def test_is_cacheable():
+    # content addressed chain calls
+    assert _is_cacheable(_payload("Filecoin.ChainGetBlock", [{"/": "bafy"}]))
+    assert _is_cacheable(_payload("Filecoin.ChainGetGenesis", []))
+    assert not _is_cacheable(_payload("Filecoin.ChainGetTipSet", [[]]))
+    assert not _is_cacheable(_payload("Filecoin.ChainGetTipSetByHeight", [100, None]))
+
+    # state calls only when pinned to a tipset
+    assert _is_cacheable(_payload("Filecoin.StateMinerPower", ["f01", TIPSET_KEY]))
+    assert not _is_cacheable(_payload("Filecoin.StateMinerPower", ["f01", None]))
+    assert not _is_cacheable(_payload("Filecoin.StateNetworkName", []))
+
+    # anything else is never cached
+    assert not _is_cacheable(_payload("Filecoin.ChainHead", []))
+
+
+def test_cache_serves_repeated_calls():
+    stub = StubConnector()
+    client = LotusClient(stub, cache_size=10)
+
+    for _ in range(3):
+        client.Chain.tip_set_weight(TIPSET_KEY)
+    assert len(stub.payloads) == 1
+    assert client.cache_info() == {"hits": 2, "misses": 1, "maxsize": 10, "currsize": 1}
+
+    client.cache_clear()
+    client.Chain.tip_set_weight(TIPSET_KEY)
+    assert len(stub.payloads) == 2
+
+
+def test_cache_does_not_store_errors():
+    stub = StubConnector(lambda payload: {"jsonrpc": "2.0", "error": {"code": 1, "message": "boom"}})
+    client = LotusClient(stub, cache_size=10)
+
+    for _ in range(2):
+        with pytest.raises(Exception):
+            client.Chain.tip_set_weight(TIPSET_KEY)
+    assert len(stub.payloads) == 2
+    assert client.cache_info()["currsize"] == 0
+
+
+def test_cache_evicts_least_recently_used():
+    stub = StubConnector()
+    client = LotusClient(stub, cache_size=2)
+    keys = [[{"/": f"bafy{i}"}] for i in range(3)]
+
+    client.Chain.tip_set_weight(keys[0])
+    client.Chain.tip_set_weight(keys[1])
+    client.Chain.tip_set_weight(keys[0])
+    client.Chain.tip_set_weight(keys[2])
+    assert client.cache_info()["currsize"] == 2
+
+    # keys[1] was the least recently used entry
+    client.Chain.tip_set_weight(keys[1])
+    assert len(stub.payloads) == 4
+    client.Chain.tip_set_weight(keys[0])
+    assert len(stub.payloads) == 5
+
+
+def test_cache_hits_are_not_affected_by_changes_to_earlier_results():
+    stub = StubConnector(lambda payload: {"jsonrpc": "2.0", "result": ["f01", "f02"]})
+    client = LotusClient(stub, cache_size=10)
+    tipset = Tipset(10, [Cid("bafy2bzacea")])
+
+    client.State.list_actors(tipset).clear()
+    actors = client.State.list_actors(tipset)
+    assert actors == ["f01", "f02"]
+    assert len(stub.payloads) == 1
+
+    actors.append("f03")
+    assert client.State.list_actors(tipset) == ["f01", "f02"]
+
+
+def test_cache_forwards_streaming_calls():
+    stub = StubConnector()
+    client = LotusClient(stub, cache_size=10)
+
+    assert list(client.State.iter_actors()) == ["f01", "f02"]
+    assert stub.payloads[0]["method"] == "Filecoin.StateListActors"
+
+
+def test_cache_coalesces_in_flight_calls():
+    release = threading.Event()
+
+    def handler(payload):
+        release.wait(5)
+        return {"jsonrpc": "2.0", "result": "1"}
+
+    stub = StubConnector(handler)
+    client = LotusClient(stub, cache_size=10)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.Chain.tip_set_weight(TIPSET_KEY)))
+               for _ in range(2)]
+
+    # the second call starts while the first one is still waiting for its response
+    threads[0].start()
+    while not stub.payloads:
+        time.sleep(0.001)
+    threads[1].start()
+    while client.cache_info()["hits"] < 1:
+        time.sleep(0.001)
+
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [1, 1]
+    assert len(stub.payloads) == 1
+
+
+def test_batch_resolves_futures():
+    def handler(payload):
+        if payload["params"][0] == [{"/": "bad"}]:
+            return {"jsonrpc": "2.0", "error": {"code": 1, "message": "boom"}}
+        return {"jsonrpc": "2.0", "result": "7"}
+
+    stub = StubConnector(handler)
+    client = LotusClient(stub)
+
+    with client.batch() as batch:
+        good = batch.Chain.tip_set_weight(TIPSET_KEY)
+        bad = batch.Chain.tip_set_weight([{"/": "bad"}])
+        assert not good.done()
+
+    assert len(stub.batches) == 1 and len(stub.batches[0]) == 2
+    assert not stub.payloads
+    assert good.result() == 7
+    with pytest.raises(Exception):
+        bad.result()
+
+
+def test_batch_rejects_streaming_methods():
+    client = LotusClient(StubConnector())
+
+    with client.batch() as batch:
+        with pytest.raises(TypeError):
+            batch.State.iter_actors
+        with pytest.raises(TypeError):
+            batch.Chain.iter_tipsets
+        with pytest.raises(AttributeError):
+            batch.Chain.no_such_method
+
+
+BLOCK_HEADER = {
+    "Miner": "f01000",
+    "Ticket": {"VRFProof": "proof"},
+    "ElectionProof": {"WinCount": 1, "VRFProof": "proof"},
+    "BeaconEntries": [],
+    "WinPoStProof": [],
+    "Parents": [{"/": "bafyparent"}],
+    "ParentWeight": "100",
+    "Height": 10,
+    "ParentStateRoot": {"/": "bafystate"},
+    "ParentMessageReceipts": {"/": "bafyreceipts"},
+    "Messages": {"/": "bafymessages"},
+    "BLSAggregate": None,
+    "Timestamp": 0,
+    "BlockSig": None,
+    "ForkSignaling": 0,
+    "ParentBaseFee": "100",
+}
+
+
+def test_head_max_age_reuses_the_response_not_the_tipset():
+    stub = StubConnector(lambda payload: {"jsonrpc": "2.0", "result": {
+        "Height": 10, "Cids": [{"/": "bafy"}], "Blocks": [copy.deepcopy(BLOCK_HEADER)]}})
+    client = LotusClient(stub)
+
+    first = client.Chain.head(max_age=60)
+    second = client.Chain.head(max_age=60)
+    assert len(stub.payloads) == 1
+    assert first == second and first is not second
+
+    first.height = 0
+    first.blocks[0].ticket["VRFProof"] = "changed"
+    second.blocks[0].ticket["VRFProof"] = "changed"
+    third = client.Chain.head(max_age=60)
+    assert third.height == 10
+    assert third.blocks[0].ticket == {"VRFProof": "proof"}
+
+    client.Chain.head()
+    assert len(stub.payloads) == 2
+
+
+def test_addrs_listen_max_age_reuses_the_response():
+    stub = StubConnector(lambda payload: {"jsonrpc": "2.0", "result": {"ID": "12D3Koo", "Addrs": ["/ip4/127.0.0.1/tcp/1234"]}})
+    client = LotusClient(stub)
+
+    first = client.Net.addrs_listen(max_age=60)
+    second = client.Net.addrs_listen(max_age=60)
+    assert len(stub.payloads) == 1
+    assert first == second and first is not second
+
+    first.addrs.append("/ip4/10.0.0.1/tcp/1234")
+    assert client.Net.addrs_listen(max_age=60).addrs == ["/ip4/127.0.0.1/tcp/1234"]
+
+
+def test_cached_tipsets_can_be_modified_by_the_caller():
+    stub = StubConnector(lambda payload: {"jsonrpc": "2.0", "result": {
+        "Height": 10, "Cids": [{"/": "bafy"}], "Blocks": [copy.deepcopy(BLOCK_HEADER)]}})
+    client = LotusClient(stub, cache_size=10)
+
+    tipset = client.Chain.get_tip_set(TIPSET_KEY)
+    tipset.blocks[0].ticket["VRFProof"] = "changed"
+    tipset.cids.clear()
+
+    tipset = client.Chain.get_tip_set(TIPSET_KEY)
+    assert len(stub.payloads) == 1
+    assert tipset.blocks[0].ticket == {"VRFProof": "proof"}
+    assert len(tipset.cids) == 1
+
+
+def test_batch_cancels_futures_when_the_block_raises():
+    stub = StubConnector()
+    client = LotusClient(stub)
+
+    with pytest.raises(RuntimeError):
+        with client.batch() as batch:
+            future = batch.Chain.tip_set_weight(TIPSET_KEY)
+            raise RuntimeError("interrupted")
+
+    assert future.cancelled()
+    with pytest.raises(CancelledError):
+        future.result(timeout=1)
+    assert not stub.batches
@@ -0,0 +1,77 @@
+import pytest
+
+from pylotus_rpc.http_json_rpc_connector import HttpJsonRpcConnector
+from pylotus_rpc.lotus_client import LotusClient
+from pylotus_rpc.methods.net import _addrs_listen, _agent_version, _result
+
+
+@pytest.fixture
+def setup_connector():
+    host = "https://filfox.info/rpc/v0"
+    return HttpJsonRpcConnector(host=host)
+
+
+class StubConnector:
+    def __init__(self, response):
+        self.response = response
+        self.payloads = []
+
+    def execute(self, payload, debug=False):
+        self.payloads.append(payload)
+        return self.response
+
+    def execute_batch(self, payloads, debug=False):
+        self.payloads.extend(payloads)
+        return [{"jsonrpc": "2.0", "result": f"lotus-{payload['params'][0]}"} for payload in payloads]
+
+
+def test_agent_version():
+    stub = StubConnector({"jsonrpc": "2.0", "result": "lotus-1.25.0+mainnet"})
+    assert _agent_version(stub, "12D3Koo") == "lotus-1.25.0+mainnet"
+    assert stub.payloads[0]["method"] == "Filecoin.NetAgentVersion"
+    assert stub.payloads[0]["params"] == ["12D3Koo"]
+
+
+def test_agent_versions_in_a_batch():
+    stub = StubConnector(None)
+    client = LotusClient(stub)
+
+    with client.batch() as batch:
+        futures = [batch.Net.agent_version(peer_id) for peer_id in ("a", "b")]
+
+    assert [future.result() for future in futures] == ["lotus-a", "lotus-b"]
+
+
+def test_result_returns_the_result_member():
+    payload = {"jsonrpc": "2.0", "method": "Filecoin.NetAgentVersion", "params": []}
+    assert _result(payload, {"jsonrpc": "2.0", "result": "lotus"}) == "lotus"
+
+
+def test_result_raises_on_error_member():
+    payload = {"jsonrpc": "2.0", "method": "Filecoin.NetAgentVersion", "params": []}
+
+    with pytest.raises(HttpJsonRpcConnector.ApiCallError) as excinfo:
+        _result(payload, {"jsonrpc": "2.0", "error": {"code": 1, "message": "peer not found"}})
+    assert excinfo.value.method_name == "Filecoin.NetAgentVersion"
+    assert excinfo.value.message == "peer not found"
+
+
+def test_addrs_listen_parses_address_info():
+    stub = StubConnector({"jsonrpc": "2.0", "result": {"ID": "12D3Koo", "Addrs": None}})
+    address_info = _addrs_listen(stub)
+    assert address_info.peer_id == "12D3Koo"
+    assert address_info.addrs == []
+
+
+def test_addrs_listen_raises_on_error():
+    stub = StubConnector({"jsonrpc": "2.0", "error": {"code": 1, "message": "permission denied"}})
+
+    with pytest.raises(HttpJsonRpcConnector.ApiCallError):
+        _addrs_listen(stub)
+
+
+@pytest.mark.integration
+def test_addrs_listen(setup_connector):
+    address_info = _addrs_listen(setup_connector)
+    assert address_info.peer_id
+    assert len(address_info.addrs) > 0
@@ -15,6 +15,7 @@ from pylotus_rpc.methods.state import (
     _read_state,
     _list_messages,
     _list_miners,
+    _make_payload,
     _lookup_id,
     _market_balance,
     _market_participants,
@@ -49,11 +50,12 @@ from pylotus_rpc.methods.state import (
 )
 
 from pylotus_rpc.methods.chain import (
-    _get_chain_head
+    _head
 )
 
 from pylotus_rpc.types.invocation_result import InvocationResult
 from pylotus_rpc.types.cid import Cid
+from pylotus_rpc.types.tip_set import Tipset
 from pylotus_rpc.types.miner_power import MinerPower
 from pylotus_rpc.types.actor_state import ActorState
 from pylotus_rpc.types.state_compute_output import StateComputeOutput
@@ -428,7 +430,7 @@ def test_list_miners(setup_connector):
 
 @pytest.mark.integration
 def test_list_messages(setup_connector):
-    tipset = _get_chain_head(setup_connector)
+    tipset = _head(setup_connector)
     # test by getting all messages sent to the storage market actor
     result = _list_messages(setup_connector, "f05", None, tipset.height, tipset=tipset)
     assert result is not None
@@ -453,13 +455,41 @@ def test_list_actors(setup_filfox_connector):
 
 @pytest.mark.integration
 def test_get_randomness_from_tickets(setup_connector):
-    tipset = _get_chain_head(setup_connector)
+    tipset = _head(setup_connector)
     result = _get_randomness_from_tickets(setup_connector, 2, 10101, "Ynl0ZSBhcnJheQ==", tipset=tipset)
     assert result is not None
     assert len(result) > 0
     assert result == "Az/dMpZP1FcRNAnjkDKOaIeW4rPhDI+UGRu1nSqF+1A="
 
 
+def test_make_payload_does_not_modify_params():
+    params = ["f01000"]
+    tipset = Tipset(10, [Cid("bafy2bzacea")])
+    first = _make_payload("Filecoin.StateMinerPower", params, tipset)
+    second = _make_payload("Filecoin.StateMinerPower", params, tipset)
+
+    assert params == ["f01000"]
+    assert first["params"] == second["params"] == ["f01000", [{"/": "bafy2bzacea"}]]
+    assert first["params"] is not second["params"]
+
+
+def test_get_randomness_from_tickets_lets_the_node_resolve_the_head():
+    class StubConnector:
+        def __init__(self):
+            self.payloads = []
+
+        def execute(self, payload, debug=False):
+            self.payloads.append(payload)
+            return {"jsonrpc": "2.0", "result": "Az/dMpZP1FcRNAnjkDKOaIeW4rPhDI+UGRu1nSqF+1A="}
+
+    stub = StubConnector()
+    result = _get_randomness_from_tickets(stub, 2, 10101, "Ynl0ZSBhcnJheQ==", tipset=None)
+    assert result == "Az/dMpZP1FcRNAnjkDKOaIeW4rPhDI+UGRu1nSqF+1A="
+    assert len(stub.payloads) == 1
+    assert stub.payloads[0]["method"] == "Filecoin.StateGetRandomnessFromTickets"
+    assert stub.payloads[0]["params"] == [2, 10101, "Ynl0ZSBhcnJheQ==", None]
+
+
 @pytest.mark.integration
 def test_get_randomness_from_beacon(setup_connector):
     result = _get_randomness_from_beacon(setup_connector, 2, 10101, "Ynl0ZSBhcnJheQ==", tipset=None)
@@ -484,7 +514,7 @@ def test_decode_params(setup_connector):
 @pytest.mark.integration
 def test_compute(setup_connector):
     # Prepare test data
-    tipset = _get_chain_head(setup_connector)
+    tipset = _head(setup_connector)
     lst_messages  = [good_msg, good_msg2]
 
     # Call the function under test
@@ -499,14 +529,14 @@ def test_compute(setup_connector):
 
 @pytest.mark.integration
 def test_circulating_supply(setup_connector):
-    tipset = _get_chain_head(setup_connector)
+    tipset = _head(setup_connector)
     circulating_supply = _circulating_supply(setup_connector, tipset=tipset)
     assert circulating_supply > 0
 
 
 @pytest.mark.integration
 def test_call_returned_values(setup_connector):
-    tipset = _get_chain_head(setup_connector)
+    tipset = _head(setup_connector)
     invocation_result = _call(setup_connector, good_msg, tipset=tipset)
 
     assert isinstance(invocation_result, InvocationResult)
@@ -542,7 +572,7 @@ def test_call_message_error(setup_connector):
 
 @pytest.mark.integration
 def test_call_gas_charges(setup_connector):
-    tipset = _get_chain_head(setup_connector)
+    tipset = _head(setup_connector)
     invocation_result = _call(setup_connector, good_msg, tipset=tipset)
     assert invocation_result.execution_trace.gas_charges  # Ensure gas charges are returned
     for gas_charge in invocation_result.execution_trace.gas_charges:
@@ -552,7 +582,7 @@ def test_call_gas_charges(setup_connector):
 
 @pytest.mark.integration
 def test_get_account_key_success_with_tipset(setup_connector):
-    tipset = _get_chain_head(setup_connector)
+    tipset = _head(setup_connector)
     address = _account_key(setup_connector, "f047684", tipset=tipset)
     
     # Basic checks to see if the returned object is correctly formed
@@ -561,7 +591,7 @@ def test_get_account_key_success_with_tipset(setup_connector):
 
 @pytest.mark.integration
 def test_get_account_key_success(setup_connector):
-    tipset = _get_chain_head(setup_connector)
+    tipset = _head(setup_connector)
     address = _account_key(setup_connector, "f047684", tipset=None)
     
     # Basic checks to see if the returned object is correctly formed